@@ -1,5 +1,6 @@
 from .engine import RufusAIEngine
 from .analyzers import ContentAnalyzer
 from .navigator import NavigationPlanner
+from .cache import SemanticCache
 
-__all__ = ['RufusAIEngine', 'ContentAnalyzer', 'NavigationPlanner']
\ No newline at end of file
+__all__ = ['RufusAIEngine', 'ContentAnalyzer', 'NavigationPlanner', 'SemanticCache']
\ No newline at end of file
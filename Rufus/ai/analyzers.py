@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from typing import List, Dict
+import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 
 @dataclass
@@ -12,7 +13,7 @@ class ContentScore:
 
 class ContentAnalyzer:
     def __init__(self, vectorizer=None):
-        self.vectorizer = vectorizer or TfidfVectorizer(stop_words='english')
+        self.vectorizer = vectorizer or TfidfVectorizer(stop_words='english', dtype=np.float32)
     
     def analyze(self, content: str, query: str) -> ContentScore:
         # Implementation from previous RufusAIEngine
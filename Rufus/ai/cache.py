@@ -0,0 +1,166 @@
+from typing import Callable, List, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import logging
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+
+@dataclass
+class CacheEntry:
+    namespace: str
+    embedding: sp.csr_matrix
+    prompt: str
+    response: str
+    created_at: float
+
+class SemanticCache:
+    """
+    In-process cache in front of an LLM's agenerate call.
+
+    Lookups first try an exact match on the prompt, then fall back to the
+    most similar cached entry in the same namespace. Entries are evicted
+    least-recently-used first and expire after `ttl` seconds.
+    """
+    def __init__(
+        self,
+        llm,
+        similarity_threshold: float = 0.92,
+        max_entries: int = 1024,
+        ttl: float = 3600.0
+    ):
+        self.llm = llm
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.logger = logging.getLogger(__name__)
+
+        # Stateless vectorizer, so embeddings from different calls are comparable
+        self._vectorizer = HashingVectorizer(
+            stop_words='english',
+            n_features=2**18,
+            alternate_sign=False,
+            norm='l2',
+            dtype=np.float32
+        )
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._matrix = None
+        self._matrix_keys: List[str] = []
+
+    async def agenerate(
+        self,
+        prompts: List[str],
+        semantic_keys: Optional[List[str]] = None,
+        namespace: str = "",
+        validator: Optional[Callable[[str], bool]] = None
+    ) -> List[str]:
+        """
+        Returns one generated text per prompt, calling the LLM only for misses.
+
+        Args:
+            prompts: Fully rendered prompts
+            semantic_keys: Text compared for near-duplicate hits (defaults to the prompts)
+            namespace: Only entries with the same namespace can be semantic hits
+            validator: Responses it rejects are returned but not cached
+        """
+        semantic_keys = semantic_keys or prompts
+        results: List[Optional[str]] = [None] * len(prompts)
+        exact_keys = [self._exact_key(namespace, prompt) for prompt in prompts]
+
+        # Exact-match tier
+        self._evict_expired()
+        pending = []
+        for i, key in enumerate(exact_keys):
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                results[i] = entry.response
+            else:
+                pending.append(i)
+
+        # Semantic tier
+        embeddings = {}
+        misses = []
+        if pending:
+            vectors = self._vectorizer.transform([semantic_keys[i] for i in pending])
+            for row, i in enumerate(pending):
+                embeddings[i] = vectors[row]
+                entry = self._nearest(namespace, embeddings[i])
+                if entry is not None:
+                    results[i] = entry.response
+                else:
+                    misses.append(i)
+
+        if misses:
+            response = await self.llm.agenerate([prompts[i] for i in misses])
+            for i, generations in zip(misses, response.generations):
+                results[i] = generations[0].text
+                if validator is not None and not validator(results[i]):
+                    continue
+                self._put(exact_keys[i], CacheEntry(
+                    namespace=namespace,
+                    embedding=embeddings[i],
+                    prompt=prompts[i],
+                    response=results[i],
+                    created_at=time.monotonic()
+                ))
+
+        self.logger.debug("LLM cache: %d/%d hits", len(prompts) - len(misses), len(prompts))
+        return results
+
+    def clear(self):
+        """Drop all cached entries"""
+        self._entries.clear()
+        self._invalidate()
+
+    def _nearest(self, namespace: str, embedding: sp.csr_matrix) -> Optional[CacheEntry]:
+        """Return the most similar entry above the threshold, if any"""
+        if not self._entries or not embedding.nnz:
+            return None
+
+        if self._matrix is None:
+            self._matrix_keys = list(self._entries)
+            self._matrix = sp.vstack(
+                [self._entries[key].embedding for key in self._matrix_keys],
+                format='csr'
+            )
+
+        similarities = (self._matrix @ embedding.T).toarray().ravel()
+        for index in np.argsort(similarities)[::-1]:
+            if similarities[index] <= self.similarity_threshold:
+                break
+            key = self._matrix_keys[index]
+            entry = self._entries[key]
+            if entry.namespace == namespace:
+                self._entries.move_to_end(key)
+                return entry
+        return None
+
+    def _put(self, key: str, entry: CacheEntry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._invalidate()
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        expired = [
+            key for key, entry in self._entries.items()
+            if now - entry.created_at > self.ttl
+        ]
+        for key in expired:
+            del self._entries[key]
+        if expired:
+            self._invalidate()
+
+    def _invalidate(self):
+        self._matrix = None
+        self._matrix_keys = []
+
+    @staticmethod
+    def _exact_key(namespace: str, prompt: str) -> str:
+        return hashlib.md5(f"{namespace}\x00{prompt}".encode('utf-8')).hexdigest()
@@ -1,12 +1,33 @@
-from typing import List, Dict, Optional, Union
+from typing import List, Dict, Optional, Tuple, Union
+import asyncio
 import logging
-from langchain.prompts import PromptTemplate
+from string import Formatter
 from langchain.llms import BaseLLM
-from bs4 import BeautifulSoup
+from langchain.prompts import PromptTemplate
+from langchain.schema import OutputParserException
+import lxml.html
+from lxml import etree
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from scipy.sparse.linalg import norm as sparse_norm
 from dataclasses import dataclass
 
+from .cache import SemanticCache
+from ..utils.html import parse_html
+from .prompts import ANALYSIS_PROMPT, ANALYSIS_OUTPUT_PARSER, NAVIGATION_PROMPT
+
+# Optional GPU backend for hashed similarity scoring; importing cuDF on a host
+# without a usable GPU raises CUDA runtime errors, not just ImportError
+try:
+    import cudf
+    from cuml.feature_extraction.text import HashingVectorizer as GPUHashingVectorizer
+except Exception:
+    cudf = None
+    GPUHashingVectorizer = None
+
+# Raised when an LLM analysis does not match the pinned output schema
+ANALYSIS_ERRORS = (OutputParserException, KeyError, TypeError, ValueError)
+
 @dataclass
 class ContentScore:
     relevance_score: float
@@ -14,6 +35,8 @@ class ContentScore:
     information_density: float
     url: str
     summary: str
+    # False when the LLM analysis was unusable and the score is ML-only
+    llm_valid: bool = True
 
 class RufusAIEngine:
     """
@@ -25,47 +48,54 @@ class RufusAIEngine:
         llm: BaseLLM,  # Non-default parameter first
         api_key: Optional[str] = None,  # Default parameter second
         relevance_threshold: float = 0.7,
-        max_tokens: int = 1000
+        max_tokens: int = 1000,
+        llm_cache: Optional[SemanticCache] = None,
+        max_scoring_chars: int = 32768,
+        use_gpu: bool = False,
+        gpu_min_documents: int = 64
     ):
         self.llm = llm
+        self.llm_cache = llm_cache or SemanticCache(llm)
         self.api_key = api_key
         self.relevance_threshold = relevance_threshold
         self.max_tokens = max_tokens
+        self.max_scoring_chars = max_scoring_chars
         self.logger = logging.getLogger(__name__)
         
-        # Initialize prompts
-        self.analysis_prompt = PromptTemplate(
-            input_variables=["content", "query"],
-            template="""
-            Analyze the following web content in relation to the search query.
-            
-            Content: {content}
-            Query: {query}
-            
-            Provide an analysis covering:
-            1. Relevance to query (0-1 scale)
-            2. Key information points
-            3. Suggested next search directions
-            4. Content quality assessment
-            
-            Format your response as JSON.
-            """
-        )
+        # Shared vectorizer, refitted per scoring call instead of rebuilt
+        self._vectorizer = TfidfVectorizer(stop_words='english', dtype=np.float32)
         
-        self.navigation_prompt = PromptTemplate(
-            input_variables=["current_page", "links", "search_goal"],
-            template="""
-            Given the current page content and available links, determine the most promising
-            navigation paths to achieve the search goal.
-            
-            Current Page Summary: {current_page}
-            Available Links: {links}
-            Search Goal: {search_goal}
-            
-            Rank the top 3 most relevant links and explain why they should be explored next.
-            Format your response as JSON.
-            """
+        # Stateless, pre-normalized vectors for pairwise link/topic similarity
+        self._hashing_vectorizer = HashingVectorizer(
+            stop_words='english',
+            n_features=2**17,
+            alternate_sign=False,
+            norm='l2',
+            dtype=np.float32
         )
+        
+        # With use_gpu, large similarity batches go to cuML; small ones stay on
+        # CPU where launch overhead dominates
+        if use_gpu and GPUHashingVectorizer is None:
+            self.logger.warning("use_gpu requested but cuML is not available; using CPU")
+        self._use_gpu = bool(use_gpu) and GPUHashingVectorizer is not None
+        self.gpu_min_documents = gpu_min_documents
+        self._gpu_hashing_vectorizer = GPUHashingVectorizer(
+            stop_words='english',
+            n_features=2**17,
+            alternate_sign=False,
+            norm='l2',
+            dtype=np.float32
+        ) if self._use_gpu else None
+        
+        # Initialize prompts
+        self.analysis_prompt = ANALYSIS_PROMPT
+        self.analysis_parser = ANALYSIS_OUTPUT_PARSER
+        self.navigation_prompt = NAVIGATION_PROMPT
+        
+        # Static template text split out once, so rendering is a plain join
+        self._analysis_parts = self._compile_prompt(self.analysis_prompt)
+        self._navigation_parts = self._compile_prompt(self.navigation_prompt)
 
     async def analyze_content_relevance(
         self,
@@ -76,34 +106,144 @@ class RufusAIEngine:
         """
         Analyzes content relevance using both ML and LLM approaches.
         """
-        try:
-            # TF-IDF based relevance scoring
-            vectorizer = TfidfVectorizer(stop_words='english')
-            tfidf_matrix = vectorizer.fit_transform([content, query])
-            cosine_similarities = (tfidf_matrix * tfidf_matrix.T).A
-            ml_relevance_score = cosine_similarities[0, 1]
-            
-            # LLM-based analysis
-            prompt = self.analysis_prompt.format(content=content[:self.max_tokens], query=query)
-            llm_response = await self.llm.agenerate([prompt])
-            analysis = llm_response.generations[0].text
+        return (await self.analyze_content_relevance_batch([(content, url)], query))[0]
+
+    async def analyze_content_relevance_batch(
+        self,
+        pages: List[Tuple[str, str]],
+        query: str
+    ) -> List[ContentScore]:
+        """
+        Analyzes the relevance of several pages with a single batched LLM call.
+        
+        Args:
+            pages: (content, url) pairs
+            query: Search query the pages are scored against
             
-            # Calculate composite score
-            information_density = len(set(content.split())) / len(content.split())
-            topic_match = self._calculate_topic_match(content, query)
+        Returns:
+            One ContentScore per page, in input order
+        """
+        try:
+            # Score on a prefix of the page; tokenizing very long pages dominates CPU
+            scoring_contents = [content[:self.max_scoring_chars] for content, _ in pages]
             
-            return ContentScore(
-                relevance_score=(ml_relevance_score + float(analysis['relevance'])) / 2,
-                topic_match=topic_match,
-                information_density=information_density,
-                url=url,
-                summary=analysis['key_information']
+            # LLM-based analysis, one prompt per page in a single request
+            llm_contents = [content[:self.max_tokens] for content, _ in pages]
+            prompts = [
+                self._render_prompt(self._analysis_parts, content=llm_content, query=query)
+                for llm_content in llm_contents
+            ]
+            analyses = await self.llm_cache.agenerate(
+                prompts,
+                semantic_keys=llm_contents,
+                namespace=f"analysis:{query}",
+                validator=self._is_valid_analysis
             )
             
+            scores = []
+            for (_, url), scoring_content, analysis in zip(pages, scoring_contents, analyses):
+                # TF-IDF based relevance scoring
+                tfidf_matrix = self._vectorizer.fit_transform([scoring_content, query])
+                ml_relevance_score = self._sparse_cosine(tfidf_matrix[0], tfidf_matrix[1])
+                
+                # Calculate composite score
+                tokens = scoring_content.split()
+                information_density = len(set(tokens)) / max(len(tokens), 1)
+                topic_match = self._calculate_topic_match(scoring_content, query)
+                
+                # Fall back to the ML score alone if the LLM response is unusable
+                llm_relevance, summary = self._parse_analysis(analysis, url)
+                if llm_relevance is None:
+                    relevance_score = ml_relevance_score
+                else:
+                    relevance_score = (ml_relevance_score + llm_relevance) / 2
+                
+                scores.append(ContentScore(
+                    relevance_score=relevance_score,
+                    topic_match=topic_match,
+                    information_density=information_density,
+                    url=url,
+                    summary=summary,
+                    llm_valid=llm_relevance is not None
+                ))
+            return scores
+            
         except Exception as e:
             self.logger.error(f"Error analyzing content relevance: {str(e)}")
             raise
 
+    @staticmethod
+    def _compile_prompt(prompt: PromptTemplate) -> Tuple[List[str], List[str]]:
+        """
+        Splits a prompt template into its literal text and variable names.
+        
+        Partial variables are substituted into the literal text up front.
+        
+        Returns:
+            The literal parts and the variables between them; there is always one
+            more literal part than variables
+        """
+        literals = []
+        variables = []
+        pending = ''
+        for literal, field_name, _, _ in Formatter().parse(prompt.template):
+            pending += literal
+            if field_name is None:
+                continue
+            if field_name in prompt.partial_variables:
+                pending += str(prompt.partial_variables[field_name])
+            else:
+                literals.append(pending)
+                variables.append(field_name)
+                pending = ''
+        literals.append(pending)
+        return literals, variables
+
+    @staticmethod
+    def _render_prompt(compiled: Tuple[List[str], List[str]], **values) -> str:
+        """
+        Renders a prompt compiled by _compile_prompt.
+        """
+        literals, variables = compiled
+        parts = [literals[0]]
+        for variable, literal in zip(variables, literals[1:]):
+            parts.append(str(values[variable]))
+            parts.append(literal)
+        return ''.join(parts)
+
+    def _parse_analysis(self, text: str, url: str) -> Tuple[Optional[float], str]:
+        """
+        Parses an LLM analysis against the pinned output schema.
+        
+        Returns:
+            The LLM relevance (None if the response does not match the schema) and
+            the key information summary
+        """
+        try:
+            return self._load_analysis(text)
+        except ANALYSIS_ERRORS as e:
+            self.logger.warning(f"Unparseable LLM analysis for {url}: {str(e)}")
+            return None, ''
+
+    def _is_valid_analysis(self, text: str) -> bool:
+        """
+        Whether an LLM analysis matches the pinned schema; only these are cached.
+        """
+        try:
+            self._load_analysis(text)
+            return True
+        except ANALYSIS_ERRORS:
+            return False
+
+    def _load_analysis(self, text: str) -> Tuple[float, str]:
+        """
+        Reads the relevance and key information from an LLM analysis.
+        
+        Raises one of ANALYSIS_ERRORS if the response does not match the schema.
+        """
+        analysis = self.analysis_parser.parse(text)
+        return float(analysis['relevance']), str(analysis['key_information'])
+
     async def suggest_navigation_paths(
         self,
         current_content: str,
@@ -114,24 +254,25 @@ class RufusAIEngine:
         Uses LLM to suggest the most promising navigation paths.
         """
         try:
-            current_summary = self._summarize_content(current_content)
-            prompt = self.navigation_prompt.format(
+            current_summary = await asyncio.to_thread(self._summarize_content, current_content)
+            prompt = self._render_prompt(
+                self._navigation_parts,
                 current_page=current_summary,
                 links=str(available_links),
                 search_goal=search_goal
             )
             
-            response = await self.llm.agenerate([prompt])
-            suggestions = response.generations[0].text
+            suggestions = (await self.llm_cache.agenerate(
+                [prompt],
+                semantic_keys=[f"{current_summary} {available_links}"],
+                namespace=f"navigation:{search_goal}"
+            ))[0]
             
             # Process and score suggestions
+            relevances = self._estimate_links_relevance(available_links, search_goal)
             scored_links = []
-            for link in available_links:
-                relevance = self._estimate_link_relevance(
-                    link['text'],
-                    link['url'],
-                    search_goal
-                )
+            for link, relevance in zip(available_links, relevances):
+                relevance = float(relevance)
                 scored_links.append({
                     'url': link['url'],
                     'text': link['text'],
@@ -155,25 +296,29 @@ class RufusAIEngine:
     def _summarize_content(self, content: str) -> str:
         """
         Creates a brief summary of the content for navigation decisions.
+        
+        Parsing is CPU-bound, so callers on the event loop run this in a thread.
         """
-        soup = BeautifulSoup(content, 'html.parser')
-        main_content = ' '.join(soup.stripped_strings)
+        if not content or not content.strip():
+            return ''
+        tree = parse_html(content, lxml.html.fromstring)
+        etree.strip_elements(tree, 'script', 'style', etree.Comment, with_tail=False)
+        main_content = ' '.join(text.strip() for text in tree.itertext() if text.strip())
         return main_content[:500]  # Return first 500 chars as summary
 
-    def _estimate_link_relevance(
+    def _estimate_links_relevance(
         self,
-        link_text: str,
-        url: str,
+        links: List[Dict[str, str]],
         search_goal: str
-    ) -> float:
+    ) -> np.ndarray:
         """
-        Estimates the potential relevance of a link based on its text and URL.
+        Estimates the potential relevance of each link based on its text and URL.
         """
-        # Simple TF-IDF based relevance scoring
-        vectorizer = TfidfVectorizer(stop_words='english')
-        tfidf_matrix = vectorizer.fit_transform([f"{link_text} {url}", search_goal])
-        cosine_similarities = (tfidf_matrix * tfidf_matrix.T).A
-        return float(cosine_similarities[0, 1])
+        if not links:
+            return np.zeros(0, dtype=np.float32)
+        
+        documents = [f"{link['text']} {link['url']}" for link in links]
+        return self._hashed_similarities(documents, search_goal)
 
     def _calculate_exploration_priority(
         self,
@@ -190,7 +335,29 @@ class RufusAIEngine:
         """
         Calculates how well the content matches the query topic.
         """
-        # Create TF-IDF vectors for content and query
-        vectorizer = TfidfVectorizer(stop_words='english')
-        vectors = vectorizer.fit_transform([content, query])
-        return float((vectors * vectors.T).A[0, 1])
\ No newline at end of file
+        return float(self._hashed_similarities([content], query)[0])
+
+    def _hashed_similarities(self, documents: List[str], reference: str) -> np.ndarray:
+        """
+        Cosine similarity of each document to the reference text.
+        
+        The hashing vectorizer needs no fit and its rows are already
+        L2-normalized, so one sparse mat-vec gives all the cosines. With use_gpu,
+        batches of at least gpu_min_documents run on the GPU.
+        """
+        if self._use_gpu and len(documents) >= self.gpu_min_documents:
+            vectors = self._gpu_hashing_vectorizer.transform(cudf.Series(documents + [reference]))
+            return (vectors[:-1] @ vectors[-1].T).toarray().ravel().get()
+        
+        vectors = self._hashing_vectorizer.transform(documents + [reference])
+        return (vectors[:-1] @ vectors[-1].T).toarray().ravel()
+
+    @staticmethod
+    def _sparse_cosine(a, b) -> float:
+        """
+        Cosine similarity of two sparse row vectors without densifying them.
+        """
+        denominator = sparse_norm(a) * sparse_norm(b)
+        if not denominator:
+            return 0.0
+        return float(a.multiply(b).sum() / denominator)
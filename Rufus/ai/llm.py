@@ -1,9 +1,23 @@
-from transformers import pipeline
-
 class SimpleLLM:
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self.model = pipeline("text-generation", model="gpt2")  # Using GPT-2 as an example
+        # Loaded on first use; importing transformers and GPT-2 is slow and memory-heavy
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            import torch
+            from transformers import pipeline
+
+            # Half precision halves the model's memory where the device supports it
+            dtype = torch.float16 if torch.cuda.is_available() else None
+            self._model = pipeline(
+                "text-generation",
+                model="gpt2",  # Using GPT-2 as an example
+                torch_dtype=dtype
+            )
+        return self._model
 
     def generate_text(self, prompt: str) -> str:
         # Generate text using the model
@@ -1,20 +1,36 @@
 from langchain.prompts import PromptTemplate
+from langchain.output_parsers import StructuredOutputParser, ResponseSchema
+
+# Static instructions come first and the per-call variables last, so the
+# rendered prompts share a stable prefix that provider prompt caches can reuse.
+# The least stable variable of each prompt is the final one.
+
+# Pinned schema for the analysis response; only these fields are consumed
+ANALYSIS_OUTPUT_PARSER = StructuredOutputParser.from_response_schemas([
+    ResponseSchema(
+        name="relevance",
+        description="Relevance of the content to the query, from 0 to 1",
+        type="number"
+    ),
+    ResponseSchema(
+        name="key_information",
+        description="Key information points from the content relevant to the query",
+        type="string"
+    )
+])
 
 ANALYSIS_PROMPT = PromptTemplate(
     input_variables=["content", "query"],
+    partial_variables={
+        "format_instructions": ANALYSIS_OUTPUT_PARSER.get_format_instructions()
+    },
     template="""
     Analyze the following web content in relation to the search query.
     
-    Content: {content}
-    Query: {query}
-    
-    Provide an analysis covering:
-    1. Relevance to query (0-1 scale)
-    2. Key information points
-    3. Suggested next search directions
-    4. Content quality assessment
+    {format_instructions}
     
-    Format your response as JSON.
+    Query: {query}
+    Content: {content}
     """
 )
 
@@ -24,11 +40,11 @@ NAVIGATION_PROMPT = PromptTemplate(
     Given the current page content and available links, determine the most promising
     navigation paths to achieve the search goal.
     
-    Current Page Summary: {current_page}
-    Available Links: {links}
-    Search Goal: {search_goal}
-    
     Rank the top 3 most relevant links and explain why they should be explored next.
     Format your response as JSON.
+    
+    Search Goal: {search_goal}
+    Current Page Summary: {current_page}
+    Available Links: {links}
     """
-)
\ No newline at end of file
+)
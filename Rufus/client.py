@@ -1,15 +1,20 @@
 # rufus/client.py
 
 import asyncio
-from typing import List, Dict, Optional, Union
-from dataclasses import dataclass
+import heapq
+from typing import List, Dict, Optional, Tuple, Union
+from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
 
+import diskcache
+
 from .core.crawler import WebCrawler
-from .core.extractor import ContentExtractor
+from .core.extractor import ContentExtractor, ExtractedContent
 from .core.synthesizer import DocumentSynthesizer
-from .ai.engine import RufusAIEngine
+from .ai.engine import RufusAIEngine, ContentScore
+from .ai.cache import SemanticCache
+from .utils.urls import normalize_url
 from Rufus.logger import get_logger
 from .config.default import AI_CONFIG
 from Rufus.ai.llm import SimpleLLM
@@ -22,6 +27,16 @@ class SearchResult:
     relevance_score: float
     metadata: Dict
     timestamp: datetime
+    depth: int = 0
+
+@dataclass
+class CrawledPage:
+    """A crawled and extracted page waiting for relevance scoring"""
+    url: str
+    depth: int
+    page_content: Dict
+    extracted_content: ExtractedContent
+    content_score: Optional[ContentScore] = None
 
 class RufusClient:
     def __init__(
@@ -38,18 +53,36 @@ class RufusClient:
 
         # Initialize components
         self.logger = get_logger(__name__)
-        self.crawler = WebCrawler()
+        self.crawler = WebCrawler(
+            max_connections=self.config.get("max_connections", 50),
+            max_connections_per_host=self.config.get("max_connections_per_host", 10)
+        )
         self.extractor = ContentExtractor()
         self.synthesizer = DocumentSynthesizer()
         
+        # Persistent crawl/score cache so repeated runs skip network and LLM work;
+        # opened on first use so constructing a client touches no files
+        self._cache: Optional[diskcache.Cache] = None
+        self.cache_ttl = self.config.get("cache_ttl", 86400)
+        
         valid_params = {
             "api_key": api_key,
             "relevance_threshold": self.config.get("relevance_threshold", 0.7),
-            "llm": llm  # Pass the llm argument here
+            "max_scoring_chars": self.config.get("max_scoring_chars", 32768),
+            "use_gpu": self.config.get("use_gpu", False),
+            "gpu_min_documents": self.config.get("gpu_min_documents", 64),
+            "llm": llm,  # Pass the llm argument here
+            "llm_cache": SemanticCache(llm, **self.config.get("llm_cache", {}))
         }
         
         self.ai_engine = RufusAIEngine(**valid_params)
         
+    @property
+    def cache(self) -> diskcache.Cache:
+        """Crawl/score cache under output_dir, opened lazily on first access."""
+        if self._cache is None:
+            self._cache = diskcache.Cache(str(self.output_dir / ".cache"))
+        return self._cache
         
     async def scrape(
         self,
@@ -75,59 +108,69 @@ class RufusClient:
         self.logger.info(f"Starting search with instructions: {instructions}")
         results = []
         visited_urls = set()
-        urls_to_visit = [url]
+        start_url = normalize_url(url)
+        # Max-heap on exploration priority: (-priority, url, depth)
+        urls_to_visit = [(-1.0, start_url, 0)]
+        queued_urls = {start_url}
+        semaphore = asyncio.Semaphore(self.config.get("max_concurrent_pages", 10))
+        batch_size = self.config.get("analysis_batch_size", 8)
+        pending = set()
+        crawled_pages = []
         
         try:
-            while urls_to_visit and len(visited_urls) < max_pages:
-                current_url = urls_to_visit.pop(0)
+            while urls_to_visit or pending or crawled_pages:
+                # Schedule frontier URLs while the page budget allows
+                while urls_to_visit and len(visited_urls) < max_pages:
+                    _, current_url, depth = heapq.heappop(urls_to_visit)
+                    visited_urls.add(current_url)
+                    pending.add(asyncio.create_task(self._crawl_page(
+                        current_url,
+                        depth,
+                        instructions,
+                        semaphore
+                    )))
                 
-                if current_url in visited_urls:
-                    continue
-                    
-                # Crawl page
-                self.logger.debug(f"Crawling: {current_url}")
-                page_content = await self.crawler.crawl(current_url)
-                visited_urls.add(current_url)
+                if not pending and not crawled_pages:
+                    break
                 
-                # Extract content
-                extracted_content = self.extractor.extract(page_content, current_url)
+                if pending:
+                    done, pending = await asyncio.wait(
+                        pending,
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+                    # Pages that failed to crawl come back as None and are skipped
+                    crawled_pages.extend(
+                        page for page in (task.result() for task in done)
+                        if page is not None
+                    )
                 
-                # Analyze relevance
-                content_score = await self.ai_engine.analyze_content_relevance(
-                    extracted_content,
-                    instructions,
-                    current_url
+                # Score in batches; flush early when nothing else is in flight
+                if len(crawled_pages) < batch_size and pending:
+                    continue
+                
+                # Never score more than batch_size pages in one LLM call
+                scored_pages = await self._score_pages(
+                    crawled_pages[:batch_size], instructions, min_relevance
                 )
+                crawled_pages = crawled_pages[batch_size:]
                 
-                # Store relevant content
-                if content_score.relevance_score >= min_relevance:
-                    results.append(SearchResult(
-                        url=current_url,
-                        content=extracted_content,
-                        relevance_score=content_score.relevance_score,
-                        metadata={
-                            "topic_match": content_score.topic_match,
-                            "information_density": content_score.information_density
-                        },
-                        timestamp=datetime.now()
-                    ))
-                    
-                    # Get navigation suggestions
-                    next_pages = await self.ai_engine.suggest_navigation_paths(
-                        extracted_content,
-                        self.crawler.get_links(),
-                        instructions
-                    )
+                for result, next_pages in scored_pages:
+                    results.append(result)
                     
-                    # Add promising URLs to queue
+                    # Add promising URLs to queue, skipping anything already queued or visited
                     for page in next_pages:
-                        if (page["url"] not in visited_urls and 
+                        next_url = normalize_url(page["url"])
+                        if (next_url not in queued_urls and 
                             page["relevance_score"] > min_relevance):
-                            urls_to_visit.append(page["url"])
+                            queued_urls.add(next_url)
+                            heapq.heappush(
+                                urls_to_visit,
+                                (-page["exploration_priority"], next_url, result.depth + 1)
+                            )
                 
             # Synthesize results
             documents = self.synthesizer.synthesize(
-                results,
+                [asdict(result) for result in results],
                 format=output_format
             )
             
@@ -144,9 +187,136 @@ class RufusClient:
             return documents
             
         except Exception as e:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
             self.logger.error(f"Error during scraping: {str(e)}")
             raise
 
+    async def _crawl_page(
+        self,
+        url: str,
+        depth: int,
+        instructions: str,
+        semaphore: asyncio.Semaphore
+    ) -> Optional[CrawledPage]:
+        """
+        Crawl and extract a single page, reusing a cached crawl and score if present.
+        
+        Returns:
+            The crawled page, or None if it could not be crawled or extracted
+        """
+        async with semaphore:
+            try:
+                # Scores depend on the instructions, so they are part of the key
+                cached = self.cache.get((url, instructions))
+                
+                if cached is not None:
+                    self.logger.debug("Cache hit: %s", url)
+                    page_content, score_fields = cached
+                    content_score = ContentScore(**score_fields)
+                else:
+                    # Crawl page
+                    self.logger.debug("Crawling: %s", url)
+                    page_content = await self.crawler.crawl(url)
+                    content_score = None
+                
+                # Extract content; sections are not used here, so stream-parse
+                extracted_content = self.extractor.extract(
+                    page_content["content"], url, include_sections=False
+                )
+            except Exception as e:
+                # One bad page must not abort the rest of the crawl
+                self.logger.warning("Skipping %s: %s", url, e)
+                return None
+            
+            return CrawledPage(
+                url=url,
+                depth=depth,
+                page_content=page_content,
+                extracted_content=extracted_content,
+                content_score=content_score
+            )
+
+    async def _score_pages(
+        self,
+        pages: List[CrawledPage],
+        instructions: str,
+        min_relevance: float
+    ) -> List[Tuple[SearchResult, List[Dict]]]:
+        """
+        Score a batch of crawled pages and plan navigation from the relevant ones.
+        
+        Pages without a cached score are analyzed together in one batched LLM call.
+        
+        Returns:
+            A search result and its suggested next pages for each relevant page
+        """
+        unscored = [page for page in pages if page.content_score is None]
+        if unscored:
+            # Analyze relevance
+            content_scores = await self.ai_engine.analyze_content_relevance_batch(
+                [(page.extracted_content.main_content, page.url) for page in unscored],
+                instructions
+            )
+            for page, content_score in zip(unscored, content_scores):
+                page.content_score = content_score
+                # ML-only fallback scores are retried on the next run, not cached
+                if not content_score.llm_valid:
+                    continue
+                self.cache.set(
+                    (page.url, instructions),
+                    (page.page_content, asdict(content_score)),
+                    expire=self.cache_ttl
+                )
+        
+        relevant = [
+            page for page in pages
+            if page.content_score.relevance_score >= min_relevance
+        ]
+        
+        # Get navigation suggestions
+        next_pages = await asyncio.gather(*(
+            self.ai_engine.suggest_navigation_paths(
+                page.extracted_content.main_content,
+                [dict(link, depth=page.depth + 1) for link in page.page_content["links"]],
+                instructions
+            )
+            for page in relevant
+        ))
+        
+        return [
+            (
+                SearchResult(
+                    url=page.url,
+                    content=page.extracted_content.main_content,
+                    relevance_score=page.content_score.relevance_score,
+                    metadata={
+                        "topic_match": page.content_score.topic_match,
+                        "information_density": page.content_score.information_density
+                    },
+                    timestamp=datetime.now(),
+                    depth=page.depth
+                ),
+                suggestions
+            )
+            for page, suggestions in zip(relevant, next_pages)
+        ]
+
+    async def close(self):
+        """Release network resources held by the crawler and the result cache."""
+        await self.crawler.close()
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+    async def _run_and_close(self, coro):
+        """Run a coroutine, then release loop-bound resources before the loop exits."""
+        try:
+            return await coro
+        finally:
+            await self.close()
+
 
     async def scrape_multiple(
         self,
@@ -156,12 +326,20 @@ class RufusClient:
     ) -> List[Dict]:
         """
         Scrape multiple URLs in parallel.
+        
+        At most config["max_concurrency"] scrapes run at once; all of them share
+        the crawler's connection pool.
         """
-        tasks = [
-            self.scrape(url, instructions, **kwargs)
-            for url in urls
-        ]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        semaphore = asyncio.Semaphore(self.config.get("max_concurrency", 8))
+        
+        async def scrape_one(url: str) -> List[Dict]:
+            async with semaphore:
+                return await self.scrape(url, instructions, **kwargs)
+        
+        results = await asyncio.gather(
+            *(scrape_one(url) for url in urls),
+            return_exceptions=True
+        )
         
         # Filter out errors and flatten results
         documents = []
@@ -182,7 +360,7 @@ class RufusClient:
         """
         Synchronous version of scrape() for easier usage.
         """
-        return asyncio.run(self.scrape(url, instructions, **kwargs))
+        return asyncio.run(self._run_and_close(self.scrape(url, instructions, **kwargs)))
     
     def scan_multiple(
         self,
@@ -193,7 +371,7 @@ class RufusClient:
         """
         Synchronous version of scrape_multiple() for easier usage.
         """
-        return asyncio.run(self.scrape_multiple(urls, instructions, **kwargs))
+        return asyncio.run(self._run_and_close(self.scrape_multiple(urls, instructions, **kwargs)))
 
 # Example usage
 if __name__ == "__main__":
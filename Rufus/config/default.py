@@ -1,11 +1,25 @@
 AI_CONFIG = {
     "relevance_threshold": 0.7,
     "max_tokens": 1000,
+    "max_scoring_chars": 32768,
     #"depth_penalty_factor": 1.0,
     "min_content_length": 100,
+    "max_concurrency": 8,  # scrapes run at once by scrape_multiple
+    "max_concurrent_pages": 10,  # pages in flight within one scrape
+    "max_connections": 50,
+    "max_connections_per_host": 10,
+    "analysis_batch_size": 8,  # pages scored per batched LLM call
+    "cache_ttl": 86400,  # seconds a crawled page and its score stay cached
+    "use_gpu": False,  # score large similarity batches with cuML
+    "gpu_min_documents": 64,  # smallest batch sent to the GPU
     "llm_config": {
         "temperature": 0.7,
         "max_tokens": 1000,
         "model": "gpt-3.5-turbo"  # or your preferred model
+    },
+    "llm_cache": {
+        "similarity_threshold": 0.92,
+        "max_entries": 1024,
+        "ttl": 3600
     }
 }
\ No newline at end of file
@@ -1,27 +1,101 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
 import asyncio
-import requests
-from typing import Dict, List, Optional
+import aiohttp
+import json
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
 import logging
 
 class WebCrawler:
-    def __init__(self, headless: bool = True):
+    def __init__(
+        self,
+        headless: bool = True,
+        max_connections: int = 50,
+        max_connections_per_host: int = 10,
+        timeout: float = 30.0,
+        browser_pool_size: int = 4,
+        min_static_text_length: int = 500
+    ):
         self.logger = logging.getLogger(__name__)
-        self.setup_selenium(headless)
+        self.headless = headless
         self.links = []
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self.session: Optional[aiohttp.ClientSession] = None
+        
+        # Browser is only launched the first time a page needs rendering
+        self.browser_pool_size = browser_pool_size
+        self.min_static_text_length = min_static_text_length
+        self._playwright = None
+        self._browser = None
+        self._contexts = []
+        self._context_pool: Optional[asyncio.Queue] = None
+        self._browser_lock: Optional[asyncio.Lock] = None
 
-    def setup_selenium(self, headless: bool):
-        """Setup Selenium WebDriver for dynamic content"""
-        options = Options()
-        if headless:
-            options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        self.driver = webdriver.Chrome(options=options)
+    async def _get_context_pool(self) -> asyncio.Queue:
+        """Launch the headless browser and its context pool on first use"""
+        if self._browser_lock is None:
+            self._browser_lock = asyncio.Lock()
+        async with self._browser_lock:
+            if self._context_pool is None:
+                try:
+                    self._playwright = await async_playwright().start()
+                    self._browser = await self._playwright.chromium.launch(
+                        headless=self.headless,
+                        args=['--no-sandbox', '--disable-dev-shm-usage']
+                    )
+                    pool = asyncio.Queue()
+                    for _ in range(self.browser_pool_size):
+                        context = await self._browser.new_context()
+                        self._contexts.append(context)
+                        pool.put_nowait(context)
+                except Exception:
+                    # Don't leave a half-started Playwright behind for the next call
+                    await self._close_browser()
+                    raise
+                self._context_pool = pool
+        return self._context_pool
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on the running loop"""
+        if self.session is None or self.session.closed:
+            # Per-host cap keeps parallel scrapes of one site within polite limits
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                ttl_dns_cache=300
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self.session
+
+    async def close(self):
+        """Close the shared HTTP session and the browser, if it was launched"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        
+        await self._close_browser()
+        self._browser_lock = None
+
+    async def _close_browser(self):
+        """Close browser contexts, the browser and Playwright, whichever were started"""
+        try:
+            for context in self._contexts:
+                await context.close()
+            if self._browser is not None:
+                await self._browser.close()
+            if self._playwright is not None:
+                await self._playwright.stop()
+        finally:
+            self._playwright = None
+            self._browser = None
+            self._contexts = []
+            self._context_pool = None
 
     async def crawl(self, url: str) -> Dict:
         """Enhanced crawler with dynamic content support"""
@@ -29,23 +103,30 @@ class WebCrawler:
             # Regular request first for efficiency
             response = await self._make_request(url)
             
-            # Check if page might have dynamic content
-            if self._might_have_dynamic_content(response):
-                content = await self._handle_dynamic_content(url)
-            else:
-                content = response
+            # Parse once off the event loop; every extractor below reuses this tree
+            content = response
+            soup = await asyncio.to_thread(BeautifulSoup, content, 'lxml')
             
-            # Extract links
-            self.links = self._extract_links(content)
+            # Check if page might have dynamic content
+            if self._might_have_dynamic_content(content, soup):
+                try:
+                    rendered = await self._handle_dynamic_content(url)
+                except Exception as e:
+                    # The static HTML is already in hand; use it rather than fail
+                    self.logger.warning(f"Rendering {url} failed, using static HTML: {str(e)}")
+                else:
+                    content = rendered
+                    soup = await asyncio.to_thread(BeautifulSoup, content, 'lxml')
             
-            # Extract structured data
-            structured_data = self._extract_structured_data(content)
+            # Extract links and structured data in a single pass
+            links, structured_data = self._extract_all(soup, url)
+            self.links = links
             
             return {
                 "url": url,
                 "content": content,
                 "structured_data": structured_data,
-                "links": self.links
+                "links": links
             }
 
         except Exception as e:
@@ -54,87 +135,96 @@ class WebCrawler:
 
     async def _make_request(self, url: str) -> str:
         """Make a regular HTTP request to fetch the page content"""
+        session = await self._get_session()
         try:
-            response = requests.get(url)
-            response.raise_for_status()  # Raise an error for bad responses
-            return response.text
-        except requests.RequestException as e:
+            async with session.get(url) as response:
+                response.raise_for_status()  # Raise an error for bad responses
+                return await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             self.logger.error(f"Error making request to {url}: {str(e)}")
             raise
 
     async def _handle_dynamic_content(self, url: str) -> str:
-        """Handle JavaScript-rendered content"""
+        """Handle JavaScript-rendered content; errors propagate to crawl()'s fallback"""
+        pool = await self._get_context_pool()
+        context = await pool.get()
         try:
-            # Use Selenium for dynamic content
-            self.driver.get(url)
-            
-            # Wait for dynamic content to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located(("tag name", "body"))
-            )
-            
-            # Allow for additional rendering time
-            await asyncio.sleep(2)
-            
-            # Get rendered content
-            return self.driver.page_source
-            
-        except Exception as e:
-            self.logger.error(f"Error handling dynamic content: {str(e)}")
-            raise
-
-    def _extract_links(self, content: str) -> List[str]:
-        """Extract links from the page content"""
-        soup = BeautifulSoup(content, 'html.parser')
-        links = [a['href'] for a in soup.find_all('a', href=True)]
-        return links
-
-    def _extract_structured_data(self, content: str) -> Dict:
-        """Extract structured data like Schema.org markup"""
-        soup = BeautifulSoup(content, 'html.parser')
-        structured_data = {
-            "schema_org": self._extract_schema_org(soup),
-            "meta_tags": self._extract_meta_tags(soup),
-            "open_graph": self._extract_open_graph(soup)
-        }
-        return structured_data
-
-    def _extract_schema_org(self, soup: BeautifulSoup) -> Optional[Dict]:
-        """Extract Schema.org structured data"""
-        schema_data = {}
-        schema_tags = soup.find_all('script', type='application/ld+json')
-        for tag in schema_tags:
+            page = await context.new_page()
             try:
-                data = json.loads(tag.string)
-                if isinstance(data, list):
-                    schema_data.update({item.get('@type'): item for item in data})
-                else:
-                    schema_data[data.get('@type')] = data
-            except Exception as e:
-                self.logger.error(f"Error parsing schema data: {str(e)}")
-        return schema_data
+                # Wait for the network to settle so client-side rendering can finish
+                await page.goto(url, wait_until="networkidle", timeout=self.timeout * 1000)
+                return await page.content()
+            finally:
+                await page.close()
+        finally:
+            pool.put_nowait(context)
 
-    def _extract_meta_tags(self, soup: BeautifulSoup) -> Dict:
-        """Extract meta tags from the page"""
+    def _extract_all(self, soup: BeautifulSoup, base_url: str) -> Tuple[List[Dict[str, str]], Dict]:
+        """
+        Extract links, Schema.org data, meta tags and Open Graph metadata.
+        
+        All of them come from <a>, <meta> and <script> tags, so a single
+        find_all over those tags feeds every extractor.
+        
+        Returns:
+            Absolute http(s) links with their anchor text, and the structured data
+        """
+        links = []
+        schema_data = {}
         meta_tags = {}
-        for tag in soup.find_all('meta'):
-            name = tag.get('name')
-            property_name = tag.get('property')
-            content = tag.get('content')
-            if name:
-                meta_tags[name] = content
-            elif property_name:
-                meta_tags[property_name] = content
-        return meta_tags
-
-    def _extract_open_graph(self, soup: BeautifulSoup) -> Dict:
-        """Extract Open Graph metadata"""
         og_data = {}
-        for tag in soup.find_all('meta'):
-            if tag.get('property', '').startswith('og:'):
-                og_data[tag.get('property')] = tag.get('content')
-        return og_data
+        
+        for tag in soup.find_all(['a', 'meta', 'script']):
+            if tag.name == 'a':
+                if tag.has_attr('href'):
+                    link_url = urljoin(base_url, tag['href'])
+                    # Skip mailto:, javascript:, tel: and other non-web hrefs
+                    if urlparse(link_url).scheme not in ('http', 'https'):
+                        continue
+                    links.append({
+                        "url": link_url,
+                        "text": tag.get_text(" ", strip=True)
+                    })
+            elif tag.name == 'meta':
+                name = tag.get('name')
+                property_name = tag.get('property')
+                content = tag.get('content')
+                if name:
+                    meta_tags[name] = content
+                elif property_name:
+                    meta_tags[property_name] = content
+                if (property_name or '').startswith('og:'):
+                    og_data[property_name] = content
+            elif tag.get('type') == 'application/ld+json':
+                self._add_schema_org(schema_data, tag.string)
+        
+        structured_data = {
+            "schema_org": schema_data,
+            "meta_tags": meta_tags,
+            "open_graph": og_data
+        }
+        return links, structured_data
+
+    def _add_schema_org(self, schema_data: Dict, raw: Optional[str]):
+        """Parse one Schema.org JSON-LD block into schema_data, keyed by @type"""
+        try:
+            data = json.loads(raw)
+            if isinstance(data, list):
+                schema_data.update({item.get('@type'): item for item in data})
+            else:
+                schema_data[data.get('@type')] = data
+        except Exception as e:
+            self.logger.error(f"Error parsing schema data: {str(e)}")
 
-    def _might_have_dynamic_content(self, content: str) -> bool:
-        """Basic heuristic to determine if a page might have dynamic content"""
-        return '<script' in content.lower()  # Adjust logic as needed
+    def _might_have_dynamic_content(self, content: str, soup: BeautifulSoup) -> bool:
+        """
+        Heuristic to determine if a page needs a browser to render its content.
+        
+        Nearly every page ships scripts, so only pages that provide a <noscript>
+        fallback and have almost no static body text are rendered.
+        """
+        if '<noscript' not in content.lower():
+            return False
+        body = soup.body
+        text = body.get_text(' ', strip=True) if body else ''
+        return len(text) < self.min_static_text_length
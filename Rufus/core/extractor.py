@@ -1,16 +1,80 @@
-from bs4 import BeautifulSoup
-from typing import Dict, List, Optional, Any
+import lxml.html
+from lxml import etree
+from typing import Dict, List, Optional, Any, Tuple
 import re
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+from functools import lru_cache
 import json
 from urllib.parse import urlparse
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
 
-from Rufus.logger import get_logger
+from Rufus.logger import get_logger, get_log_file, use_log_file
 from Rufus.exception import ExtractorException
+from Rufus.utils.html import parse_html
 import sys
 
 
-@dataclass
+# Linear-time RE2 engine when installed; the patterns below are valid for both
+try:
+    import re2 as re_fast
+except ImportError:
+    re_fast = re
+
+# Multi-keyword matching in a single scan when pyahocorasick is installed
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Compiled once at import rather than looked up in re's cache on every call
+_MAIN_CLS_RE = re_fast.compile(r'(?i)(content|main|article|post|entry)')
+
+# Common patterns for boilerplate content
+_BOILERPLATE_PATTERNS = [
+    r'cookie[s]?\s*policy',
+    r'privacy\s*policy',
+    r'terms\s*(?:of\s*)?(?:use|service)',
+    r'copyright\s*©?\s*\d{4}',
+    r'all\s*rights\s*reserved',
+]
+_BOILERPLATE_RE = re_fast.compile('(?i)' + '|'.join(_BOILERPLATE_PATTERNS))
+
+# Curly double quotes normalized to straight ones
+_QUOTES_TABLE = str.maketrans({'\u201c': '"', '\u201d': '"'})
+
+# Bytes fed to the incremental parser at a time
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Below this many pages extract_many stays in-process
+MIN_PARALLEL_PAGES = 8
+
+
+@lru_cache(maxsize=32)
+def _instruction_keywords(instructions: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Lowercased keywords of the instructions, and their unique values"""
+    keywords = tuple(instructions.lower().split())
+    return keywords, tuple(sorted(set(keywords)))
+
+@lru_cache(maxsize=32)
+def _keyword_automaton(keywords: Tuple[str, ...]):
+    """Aho-Corasick automaton over the keywords, built once per instruction set"""
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+def _matched_keywords(keywords: Tuple[str, ...], text: str) -> set:
+    """Set of keywords occurring as substrings of text"""
+    if ahocorasick is None:
+        return {keyword for keyword in keywords if keyword in text}
+    return {keyword for _, keyword in _keyword_automaton(keywords).iter(text)}
+
+
+@dataclass(slots=True, frozen=True)
 class ExtractedContent:
     """Data class to store extracted content in a structured format"""
     url: str
@@ -18,13 +82,13 @@ class ExtractedContent:
     main_content: str
     metadata: Dict[str, Any]
     sections: List[Dict[str, str]]
-    links: List[str]
+    links: Tuple[str, ...]
     relevance_score: float
 
 class ContentExtractionError(ExtractorException):
     """Raised when content extraction fails"""
     def __init__(self, message: str, error_detail: str):
-        super().__init__(message)
+        super().__init__(message, sys)
         self.error_detail = error_detail
     pass
 
@@ -33,73 +97,44 @@ class ContentCleaningError(ExtractorException):
     pass
 
 class ContentExtractor:
-    def __init__(self):
-        self.logger = get_logger(__name__)  # Ensure the logger is initialized
-
-    def extract(self, html_content: str, url: str) -> ExtractedContent:
-        try:
-            # Ensure that html_content is a string
-            if isinstance(html_content, dict):
-                html_content = html_content.get('content', '')
-
-            soup = BeautifulSoup(html_content, 'html.parser')
-
-            # Extract title
-            title = soup.title.string if soup.title else ''
-            title = self._clean_text(title)
-
-            # Extract metadata
-            metadata = self._extract_metadata(soup)
-
-            # Extract main content
-            main_content = self._extract_main_content(soup)
-
-            # Extract sections
-            sections = self._extract_sections(soup)
-
-            # Extract links
-            links = [a.get('href') for a in soup.find_all('a', href=True)]
-
-            # Calculate relevance
-            relevance_score = self._calculate_relevance(main_content, metadata)
-
-            extracted_content = ExtractedContent(
-                url=url,
-                title=title,
-                main_content=main_content,
-                metadata=metadata,
-                sections=sections,
-                links=links,
-                relevance_score=relevance_score
-            )
-
-            self.logger.info(f"Successfully extracted content from {url}")
-            return extracted_content
-
-        except Exception as e:
-            self.logger.error(f"Content extraction failed for {url}: {str(e)}")
-            raise ContentExtractionError(f"Failed to extract content from {url}: {str(e)}", str(e))
+    def __init__(self, instructions: Optional[str] = None):
         """
         Initialize the content extractor.
         
         Args:
             instructions (str, optional): Specific instructions for content extraction
         """
-        '''self.logger = rufus_logger
+        self.logger = get_logger(__name__)  # Ensure the logger is initialized
         self.instructions = instructions
         self.important_tags = {
             'article', 'main', 'section', 'div', 'p', 'h1', 'h2', 'h3',
             'table', 'ul', 'ol', 'dl'
         }
         # Common patterns for boilerplate content
-        self.boilerplate_patterns = [
-            r'cookie[s]?\s*policy',
-            r'privacy\s*policy',
-            r'terms\s*(?:of\s*)?(?:use|service)',
-            r'copyright\s*©?\s*\d{4}',
-            r'all\s*rights\s*reserved',
-        ]
-        self.boilerplate_regex = re.compile('|'.join(self.boilerplate_patterns), re.IGNORECASE)'''
+        self.boilerplate_patterns = _BOILERPLATE_PATTERNS
+        self.boilerplate_regex = _BOILERPLATE_RE
+        # Worker pool for extract_many, started on first use and kept until close()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_workers = 0
+
+    def _parse_html(self, html_content: str) -> lxml.html.HtmlElement:
+        """
+        Parse HTML into an lxml document tree.
+        
+        Script and style elements are dropped so their source never reaches
+        the extracted text.
+        
+        Args:
+            html_content (str): Raw HTML content
+        
+        Returns:
+            lxml.html.HtmlElement: Root <html> element of the parsed document
+        """
+        if not html_content or not html_content.strip():
+            html_content = '<html><body></body></html>'
+        tree = parse_html(html_content)
+        etree.strip_elements(tree, 'script', 'style', with_tail=False)
+        return tree
 
     def _clean_text(self, text: str) -> str:
         """
@@ -107,121 +142,228 @@ class ContentExtractor:
         
         Args:
             text (str): Text to clean
-            
+        
         Returns:
             str: Cleaned text
         """
         try:
-            # Remove extra whitespace
+            # Collapse all whitespace runs, including \r\n\t, to single spaces
             text = ' '.join(text.split())
-            # Remove special characters
-            text = re.sub(r'[\r\n\t]+', ' ', text)
             # Normalize quotes
-            text = text.replace('"', '"').replace('"', '"')
-            # Remove multiple spaces
-            text = re.sub(r'\s+', ' ', text)
-            return text.strip()
+            return text.translate(_QUOTES_TABLE)
         except Exception as e:
             self.logger.error(f"Text cleaning failed: {str(e)}")
-            raise ContentCleaningError(f"Failed to clean text: {str(e)}")
+            raise ContentCleaningError(f"Failed to clean text: {str(e)}", sys)
 
-    def _extract_metadata(self, soup: BeautifulSoup) -> Dict[str, str]:
+    @staticmethod
+    def _add_meta(element: etree._Element, metadata: Dict[str, str]):
+        """Record a <meta> tag's content under its name or property."""
+        name = element.get('name')
+        property_name = element.get('property')
+        content = element.get('content', '')
+        # Get common metadata
+        if name:
+            metadata[name] = content
+        # OpenGraph og:* properties are kept even when the tag also has a name
+        if property_name and (not name or property_name.startswith('og:')):
+            metadata[property_name] = content
+
+    @staticmethod
+    def _is_main_container(element: etree._Element) -> bool:
+        return element.tag in ('main', 'article') or (
+            element.tag == 'div' and element.get('role') == 'main'
+        )
+
+    @staticmethod
+    def _is_main_class(element: etree._Element) -> bool:
+        return element.tag == 'div' and bool(_MAIN_CLS_RE.search(element.get('class', '')))
+
+    def _extract_all(
+        self, tree: lxml.html.HtmlElement
+    ) -> Tuple[str, Dict[str, str], Optional[lxml.html.HtmlElement], List[Dict[str, str]], List[str]]:
         """
-        Extract metadata from HTML meta tags.
+        Collect title, metadata, main content root, sections and links in one
+        document-order pass over the tree.
         
         Args:
-            soup (BeautifulSoup): Parsed HTML
-            
+            tree (lxml.html.HtmlElement): Parsed HTML
+        
         Returns:
-            Dict[str, str]: Extracted metadata
+            Tuple of the title, metadata, main content root (None if no
+            container was found), sections and links
         """
+        title = None
         metadata = {}
-        try:
-            # Extract meta tags
-            meta_tags = soup.find_all('meta')
-            for tag in meta_tags:
-                # Get common metadata
-                if tag.get('name'):
-                    metadata[tag['name']] = tag.get('content', '')
-                elif tag.get('property'):
-                    metadata[tag['property']] = tag.get('content', '')
-                    
-            # Extract OpenGraph metadata
-            og_tags = soup.find_all('meta', property=re.compile(r'^og:'))
-            for tag in og_tags:
-                metadata[tag['property']] = tag.get('content', '')
-                
-            return metadata
-        except Exception as e:
-            self.logger.warning(f"Metadata extraction partial or failed: {str(e)}")
-            return metadata
+        main_root = None
+        class_root = None
+        links = []
+        sections = []
+        header_tags = {'h1', 'h2', 'h3'}
+        # Section currently collecting siblings, keyed by the parent of its header
+        open_sections = {}
+        
+        for element in tree.iter():
+            tag = element.tag
+            parent = element.getparent()
+            
+            if tag == 'meta':
+                self._add_meta(element, metadata)
+            elif tag == 'a':
+                href = element.get('href')
+                if href is not None:
+                    links.append(href)
+            elif tag == 'title' and title is None:
+                title = element.text_content()
+            
+            # First main container in document order, with a class-name fallback
+            if main_root is None:
+                if self._is_main_container(element):
+                    main_root = element
+                elif class_root is None and self._is_main_class(element):
+                    class_root = element
+            
+            # A section spans its header's following siblings up to the next header among them
+            if tag in header_tags:
+                section = {
+                    'header': self._clean_text(element.text_content()),
+                    'content': []
+                }
+                sections.append(section)
+                open_sections[parent] = section
+            elif tag in self.important_tags and parent in open_sections:
+                # Raw text is buffered; whitespace cleaning distributes over the join
+                open_sections[parent]['content'].append(element.text_content())
+        
+        for section in sections:
+            section['content'] = self._clean_text(' '.join(section['content']))
+        if main_root is None:
+            main_root = class_root
+        return title or '', metadata, main_root, sections, links
 
-    def _extract_main_content(self, soup: BeautifulSoup) -> str:
+    def _extract_main_content(
+        self, tree: lxml.html.HtmlElement, main_root: Optional[lxml.html.HtmlElement]
+    ) -> str:
         """
         Extract main content from HTML while filtering out boilerplate.
         
         Args:
-            soup (BeautifulSoup): Parsed HTML
-            
+            tree (lxml.html.HtmlElement): Parsed HTML
+            main_root (lxml.html.HtmlElement, optional): Main content container
+                found by _extract_all
+        
         Returns:
             str: Main content
         """
         try:
-            # Try to find main content container
-            main_content = None
-            priority_tags = ['main', 'article', 'div[role="main"]']
-            
-            for tag in priority_tags:
-                main_content = soup.find(tag)
-                if main_content:
-                    break
-            
-            if not main_content:
-                # Fallback to content heuristics
-                main_content = soup.find('div', {'class': re.compile(
-                    r'(content|main|article|post|entry)', re.IGNORECASE)})
-            
-            if not main_content:
+            if main_root is None:
                 # Last resort: use body
-                main_content = soup.find('body')
-                
-            content_text = main_content.get_text() if main_content else ''
-            return self._clean_text(content_text)
+                main_root = tree.find('body')
             
+            content_text = main_root.text_content() if main_root is not None else ''
+            return self._clean_text(content_text)
+        
         except Exception as e:
             self.logger.error(f"Main content extraction failed: {str(e)}")
-            raise ContentExtractionError(f"Failed to extract main content: {str(e)}")
+            raise ContentExtractionError(f"Failed to extract main content: {str(e)}", str(e))
 
-    def _extract_sections(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
+    def _stream_extract(self, html_content: str) -> Tuple[str, Dict[str, str], str, List[str]]:
         """
-        Extract content sections with their headers.
+        Collect title, metadata, main content text and links while the HTML is
+        parsed incrementally, without keeping the whole body tree in memory.
+        
+        Each child of <body> is reduced to its text once it has been parsed,
+        and parsing stops as soon as </body> is reached.
         
         Args:
-            soup (BeautifulSoup): Parsed HTML
-            
+            html_content (str): Raw HTML content
+        
         Returns:
-            List[Dict[str, str]]: List of sections with headers and content
+            Tuple of the title, metadata, raw main content text and links
         """
-        sections = []
-        try:
-            headers = soup.find_all(['h1', 'h2', 'h3'])
-            for header in headers:
-                section_content = []
-                current = header.find_next_sibling()
-                while current and current.name not in ['h1', 'h2', 'h3']:
-                    if current.name in self.important_tags:
-                        section_content.append(self._clean_text(current.get_text()))
-                    current = current.find_next_sibling()
+        title = None
+        metadata = {}
+        links = []
+        body = None
+        body_children = []
+        # Candidate containers and their text once they are closed
+        main_root = class_root = None
+        main_text = class_text = body_text = None
+        
+        parser = etree.HTMLPullParser(
+            events=('start', 'end'), encoding='utf-8', remove_comments=True, remove_pis=True
+        )
+        # Build lxml.html elements, as document_fromstring does
+        parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+        
+        def handle_events():
+            nonlocal title, body, main_root, class_root, main_text, class_text, body_text
+            for event, element in parser.read_events():
+                tag = element.tag
+                if event == 'start':
+                    # Containers are chosen by start tag, i.e. in document order
+                    if tag == 'body' and body is None:
+                        body = element
+                    elif main_root is None and self._is_main_container(element):
+                        main_root = element
+                    elif main_root is None and class_root is None and self._is_main_class(element):
+                        class_root = element
+                    continue
                 
-                sections.append({
-                    'header': self._clean_text(header.get_text()),
-                    'content': ' '.join(section_content)
-                })
-            
-            return sections
-        except Exception as e:
-            self.logger.error(f"Section extraction failed: {str(e)}")
-            return []
+                if tag in ('script', 'style'):
+                    element.clear(keep_tail=True)
+                elif tag == 'meta':
+                    self._add_meta(element, metadata)
+                elif tag == 'a':
+                    href = element.get('href')
+                    if href is not None:
+                        links.append(href)
+                elif tag == 'title' and title is None:
+                    title = element.text_content()
+                
+                if element is main_root:
+                    main_text = element.text_content()
+                elif element is class_root:
+                    class_text = element.text_content()
+                
+                if body is not None and element.getparent() is body:
+                    # Keep only the text of finished body children
+                    body_children.append((element, element.text_content()))
+                    element.clear(keep_tail=True)
+                elif element is body:
+                    body_text = self._join_body_text(body, body_children)
+                    return
+        
+        data = html_content.encode('utf-8') if html_content else b''
+        for offset in range(0, len(data), STREAM_CHUNK_SIZE):
+            parser.feed(data[offset:offset + STREAM_CHUNK_SIZE])
+            handle_events()
+            if body_text is not None:
+                break
+        else:
+            try:
+                parser.close()
+            except etree.XMLSyntaxError:
+                # Empty document
+                pass
+            handle_events()
+        
+        if body_text is None and body is not None:
+            body_text = self._join_body_text(body, body_children)
+        
+        main_content = next(
+            (text for text in (main_text, class_text, body_text) if text is not None),
+            ''
+        )
+        return title or '', metadata, main_content, links
+
+    @staticmethod
+    def _join_body_text(body: etree._Element, children: List[Tuple[etree._Element, str]]) -> str:
+        """Rebuild body.text_content() from its cleared children's saved text."""
+        parts = [body.text or '']
+        for child, text in children:
+            parts.append(text)
+            parts.append(child.tail or '')
+        return ''.join(parts)
 
     def _calculate_relevance(self, content: str, metadata: Dict[str, str]) -> float:
         """
@@ -230,65 +372,69 @@ class ContentExtractor:
         Args:
             content (str): Extracted content
             metadata (Dict[str, str]): Content metadata
-            
+        
         Returns:
             float: Relevance score between 0 and 1
         """
         if not self.instructions:
             return 1.0
-            
+        
         try:
             # Simple relevance scoring based on keyword matching
             # This could be enhanced with more sophisticated NLP techniques
-            keywords = self.instructions.lower().split()
+            keywords, unique_keywords = _instruction_keywords(self.instructions)
             content_lower = content.lower()
             metadata_text = ' '.join(metadata.values()).lower()
             
-            # Count keyword occurrences
-            content_matches = sum(1 for keyword in keywords if keyword in content_lower)
-            metadata_matches = sum(1 for keyword in keywords if keyword in metadata_text)
+            # Count keyword occurrences; each text is scanned once for all keywords
+            content_hits = _matched_keywords(unique_keywords, content_lower)
+            metadata_hits = _matched_keywords(unique_keywords, metadata_text)
+            content_matches = sum(1 for keyword in keywords if keyword in content_hits)
+            metadata_matches = sum(1 for keyword in keywords if keyword in metadata_hits)
             
             # Calculate weighted score
             max_score = len(keywords) * 2  # Both content and metadata
             actual_score = content_matches + (metadata_matches * 0.5)
             
             return min(actual_score / max_score, 1.0)
-            
+        
         except Exception as e:
             self.logger.warning(f"Relevance calculation failed: {str(e)}")
             return 0.5
 
-    def extract(self, html_content: str, url: str) -> ExtractedContent:
+    def extract(self, html_content: str, url: str, include_sections: bool = True) -> ExtractedContent:
         """
         Extract and structure content from HTML.
         
         Args:
             html_content (str): Raw HTML content
             url (str): Source URL
-            
+            include_sections (bool): Whether to extract sections; without them
+                the page is stream-parsed and no full tree is built
+        
         Returns:
             ExtractedContent: Structured content
         """
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            # Accept a crawler result as well as raw HTML
+            if isinstance(html_content, dict):
+                html_content = html_content.get('content', '')
             
-            # Extract title
-            title = soup.title.string if soup.title else ''
+            if include_sections:
+                tree = self._parse_html(html_content)
+                
+                # Title, metadata, main container, sections and links in one pass
+                title, metadata, main_root, sections, links = self._extract_all(tree)
+                
+                # Extract main content
+                main_content = self._extract_main_content(tree, main_root)
+            else:
+                title, metadata, main_text, links = self._stream_extract(html_content)
+                main_content = self._clean_text(main_text)
+                sections = []
             title = self._clean_text(title)
             
-            # Extract metadata
-            metadata = self._extract_metadata(soup)
-            
-            # Extract main content
-            main_content = self._extract_main_content(soup)
-            
-            # Extract sections
-            sections = self._extract_sections(soup)
-            
-            # Extract links
-            links = [a.get('href') for a in soup.find_all('a', href=True)]
-            
-            # Calculate relevance
+            # Calculate relevance; without instructions every page scores 1.0
             relevance_score = self._calculate_relevance(main_content, metadata)
             
             extracted_content = ExtractedContent(
@@ -297,16 +443,92 @@ class ContentExtractor:
                 main_content=main_content,
                 metadata=metadata,
                 sections=sections,
-                links=links,
+                links=tuple(links),
                 relevance_score=relevance_score
             )
             
-            self.logger.info(f"Successfully extracted content from {url}")
+            self.logger.info("Successfully extracted content from %s", url)
             return extracted_content
-            
+        
         except Exception as e:
             self.logger.error(f"Content extraction failed for {url}: {str(e)}")
-            raise ContentExtractionError(f"Failed to extract content from {url}: {str(e)}")
+            raise ContentExtractionError(f"Failed to extract content from {url}: {str(e)}", str(e))
+
+    def extract_many(
+        self,
+        pages: List[Tuple[str, str]],
+        include_sections: bool = True,
+        max_workers: Optional[int] = None
+    ) -> List[ExtractedContent]:
+        """
+        Extract several pages in parallel worker processes.
+        
+        Extraction is CPU-bound, so threads would serialize on the GIL. Small
+        batches are extracted in this process, where IPC would dominate. The
+        worker pool is started on the first parallel call and reused by later
+        ones; call close() to shut it down.
+        
+        Args:
+            pages (List[Tuple[str, str]]): (html_content, url) pairs
+            include_sections (bool): Passed through to extract
+            max_workers (int, optional): Worker processes, defaults to the CPU count
+        
+        Returns:
+            List[ExtractedContent]: One result per page, in input order
+        """
+        workers = max_workers or os.cpu_count() or 1
+        if workers <= 1 or len(pages) < MIN_PARALLEL_PAGES:
+            return [self.extract(html, url, include_sections=include_sections) for html, url in pages]
+        
+        pool = self._get_pool(workers)
+        try:
+            return list(pool.map(
+                _extract_in_worker,
+                [(html, url, include_sections) for html, url in pages],
+                chunksize=max(1, len(pages) // (4 * workers))
+            ))
+        except BrokenProcessPool:
+            # A dead worker breaks the pool for good; the next call starts a new one
+            self.close()
+            raise
+
+    def _get_pool(self, workers: int) -> ProcessPoolExecutor:
+        """Return the worker pool, restarting it if a different size is requested"""
+        if self._pool is not None and self._pool_workers != workers:
+            self.close()
+        if self._pool is None:
+            # Spawned workers do not inherit the parent's event loop or logging
+            # setup, so they are pointed at this process's log file
+            self._pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.instructions, get_log_file())
+            )
+            self._pool_workers = workers
+        return self._pool
+
+    def close(self):
+        """Shut down the extract_many worker pool, if it was started"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._pool_workers = 0
+
+# Per-process extractor used by ContentExtractor.extract_many
+_worker_extractor: Optional[ContentExtractor] = None
+
+def _init_worker(instructions: Optional[str], log_file: Optional[str]):
+    """Log to the parent's file, build the worker's extractor and warm up lxml"""
+    global _worker_extractor
+    if log_file:
+        use_log_file(log_file)
+    _worker_extractor = ContentExtractor(instructions=instructions)
+    _worker_extractor._parse_html('<html><body><p>warmup</p></body></html>')
+
+def _extract_in_worker(page: Tuple[str, str, bool]) -> ExtractedContent:
+    html_content, url, include_sections = page
+    return _worker_extractor.extract(html_content, url, include_sections=include_sections)
 
 if __name__ == "__main__":
     # Test the extractor
@@ -324,10 +546,10 @@ if __name__ == "__main__":
         </body>
     </html>
     """
-    
+
     extractor = ContentExtractor(instructions="test content")
     try:
         result = extractor.extract(test_html, "https://example.com")
-        print(json.dumps(result.__dict__, indent=2))
+        print(json.dumps(asdict(result), indent=2))
     except ExtractorException as e:
         print(f"Extraction failed: {str(e)}")
\ No newline at end of file
@@ -1,9 +1,10 @@
 from typing import List, Dict, Union
-import json
+import orjson
 import markdown
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 import logging
+import xxhash
 
 class DocumentSynthesizer:
     def __init__(self):
@@ -51,8 +52,10 @@ class DocumentSynthesizer:
         processed_results = []
         
         for result in results:
-            # Create content fingerprint
-            content_hash = hash(result["content"])
+            # Create content fingerprint; whitespace is canonicalized so reflowed
+            # copies collapse, and xxh3 is stable across runs unlike hash()
+            canonical = ' '.join(result["content"].split())
+            content_hash = xxhash.xxh3_64_intdigest(canonical.encode('utf-8'))
             
             if content_hash not in seen_content:
                 seen_content.add(content_hash)
@@ -63,11 +66,13 @@ class DocumentSynthesizer:
     def _structure_documents(self, results: List[Dict]) -> List[Dict]:
         """Structure documents for RAG consumption"""
         documents = []
+        # One timestamp for the whole batch
+        timestamp = datetime.now(timezone.utc).isoformat()
         
         for result in results:
             doc = {
                 "url": result["url"],
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp,
                 "content": result["content"],
                 "metadata": {
                     "relevance_score": result.get("relevance_score", 0),
@@ -86,11 +91,14 @@ class DocumentSynthesizer:
     def save(self, documents: Union[List[Dict], str], output_file: Path):
         """Save synthesized documents to file"""
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
+            with open(output_file, 'wb') as f:
                 if isinstance(documents, list):
-                    json.dump(documents, f, indent=2, ensure_ascii=False)
+                    f.write(orjson.dumps(
+                        documents,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                    ))
                 else:
-                    f.write(documents)  
+                    f.write(documents.encode('utf-8'))
                     
             self.logger.info(f"Saved documents to {output_file}")
             
@@ -26,6 +26,18 @@ class RufusException(Exception):
     def __str__(self):
         return self.error_message
 
+    def __reduce__(self):
+        # __init__ reads the active traceback and logs, so unpickling (e.g. an
+        # error raised in a worker process) must restore state without it
+        return _rebuild_exception, (type(self), self.args, self.__dict__)
+
+def _rebuild_exception(cls, args, state):
+    """Recreate a pickled RufusException without calling __init__"""
+    error = cls.__new__(cls, *args)
+    error.args = args
+    error.__dict__.update(state)
+    return error
+
 # Specific Exception Classes
 class CrawlerException(RufusException):
     """Exception raised for errors in the web crawler"""
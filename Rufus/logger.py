@@ -2,34 +2,42 @@ import logging
 import os
 from datetime import datetime
 
+LOG_FORMAT = "[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s"
+
+def _file_handler(path, formatter):
+    # Opened on the first record, so a process that never logs creates no file
+    handler = logging.FileHandler(path, encoding="utf-8", delay=True)
+    handler.setFormatter(formatter)
+    return handler
+
 class RufusLogger:
     def __init__(self):
+        self.logger = logging.getLogger("Rufus")
+
+        # Configure once per process; later instances reuse the existing handlers
+        if not self.logger.handlers:
+            self._configure()
+
+    def _configure(self):
         # Create logs directory
         self.LOG_FILE = f"rufus_{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
         self.logs_path = os.path.join(os.getcwd(), "logs")
         os.makedirs(self.logs_path, exist_ok=True)
-        
+
         # Create log file path
         self.LOG_FILE_PATH = os.path.join(self.logs_path, self.LOG_FILE)
-        
-        # Configure logging
-        logging.basicConfig(
-            filename=self.LOG_FILE_PATH,
-            format="[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s",
-            level=logging.INFO
-        )
-        
+
+        formatter = logging.Formatter(LOG_FORMAT)
+        self.logger.addHandler(_file_handler(self.LOG_FILE_PATH, formatter))
+
         # Add console handler for development
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
-        formatter = logging.Formatter(
-            "[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s"
-        )
         console_handler.setFormatter(formatter)
-        logging.getLogger('').addHandler(console_handler)
-        
-        self.logger = logging.getLogger("Rufus")
-        
+
+        self.logger.addHandler(console_handler)
+        self.logger.setLevel(logging.INFO)
+
     def get_logger(self):
         return self.logger
 
@@ -37,8 +45,26 @@ class RufusLogger:
 rufus_logger = RufusLogger().get_logger()
 
 # Function to access the logger
-def get_logger(self, name=None):
-        return logging.getLogger(name or "Rufus")
+def get_logger(name=None):
+    return logging.getLogger(name or "Rufus")
+
+def get_log_file():
+    """Path of the file the Rufus logger writes to, if any"""
+    for handler in logging.getLogger("Rufus").handlers:
+        if isinstance(handler, logging.FileHandler):
+            return handler.baseFilename
+    return None
+
+def use_log_file(path):
+    """Point the Rufus logger's file output at path, e.g. a parent process's log"""
+    logger = logging.getLogger("Rufus")
+    for handler in list(logger.handlers):
+        if isinstance(handler, logging.FileHandler):
+            if handler.baseFilename == os.path.abspath(path):
+                return
+            logger.removeHandler(handler)
+            handler.close()
+    logger.addHandler(_file_handler(path, logging.Formatter(LOG_FORMAT)))
 
 if __name__ == "__main__":
     rufus_logger.info("Rufus logging system initialized")
@@ -1,15 +1,105 @@
 # rufus/utils/helpers.py
 
+from collections import OrderedDict
 from sentence_transformers import SentenceTransformer
 import numpy as np
+import xxhash
+
+# Optional JIT for the score aggregation; numpy is used when numba is missing
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 # Load a pre-trained model for generating embeddings
 model = SentenceTransformer('all-MiniLM-L6-v2')  # You can choose other models based on your needs
 
+# LRU cache of int8-quantized embeddings, so repeated keywords and pages are encoded once
+EMBEDDING_CACHE_SIZE = 4096
+_embedding_cache = OrderedDict()
+
+def _quantize(embeddings):
+    # Normalized components lie in [-1, 1], so a fixed symmetric scale is enough for ranking
+    return np.clip(np.rint(embeddings * 127), -127, 127).astype(np.int8)
+
+def _cache_key(text):
+    # Long texts are keyed by a 64-bit digest so the cache does not keep them alive
+    if len(text) > 1024:
+        return xxhash.xxh64_intdigest(text.encode('utf-8'))
+    return text
+
+def _encode_cached(texts):
+    """
+    Returns int8-quantized normalized embeddings for texts, encoding only cache misses.
+
+    Misses are encoded together in a single batched call.
+
+    Args:
+        texts (list): Texts to embed.
+
+    Returns:
+        numpy.ndarray: One int8 embedding row per text.
+    """
+    keys = [_cache_key(text) for text in texts]
+    embeddings = {}
+    misses = {}
+    for key, text in zip(keys, texts):
+        if key in _embedding_cache:
+            _embedding_cache.move_to_end(key)
+            embeddings[key] = _embedding_cache[key]
+        else:
+            misses.setdefault(key, text)
+
+    if misses:
+        encoded = model.encode(
+            list(misses.values()),
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            batch_size=64
+        )
+        for key, embedding in zip(misses, _quantize(encoded)):
+            embeddings[key] = embedding
+            _embedding_cache[key] = embedding
+        while len(_embedding_cache) > EMBEDDING_CACHE_SIZE:
+            _embedding_cache.popitem(last=False)
+
+    return np.stack([embeddings[key] for key in keys])
+
+def compute_similarity_batch(reference_texts, candidate_texts):
+    """
+    Computes pairwise cosine similarities between two lists of texts.
+
+    Uncached texts are embedded in a single batched encode call. Embeddings
+    are L2-normalized and stored as int8, so the cosine matrix is one integer
+    matrix product rescaled by the quantized norms.
+
+    Args:
+        reference_texts (list): Reference texts, one row each.
+        candidate_texts (list): Candidate texts, one column each.
+
+    Returns:
+        numpy.ndarray: Similarity matrix of shape (len(reference_texts), len(candidate_texts)).
+    """
+    reference_texts = list(reference_texts)
+    candidate_texts = list(candidate_texts)
+
+    # Integer dot products; 384 dims of 127**2 cannot overflow int32
+    embeddings = _encode_cached(reference_texts + candidate_texts).astype(np.int32)
+    reference_embeddings = embeddings[:len(reference_texts)]
+    candidate_embeddings = embeddings[len(reference_texts):]
+
+    dots = reference_embeddings @ candidate_embeddings.T
+    reference_norms = np.einsum('ij,ij->i', reference_embeddings, reference_embeddings)
+    candidate_norms = np.einsum('ij,ij->i', candidate_embeddings, candidate_embeddings)
+
+    # Rescale by the quantized norms; identical texts score exactly 1.0
+    scale = np.sqrt(np.outer(reference_norms, candidate_norms).astype(np.float64))
+    return dots / np.maximum(scale, 1.0)
+
 def compute_similarity(reference_text, candidate_text):
     """
     Computes cosine similarity between two texts using embeddings.
-    
+
     Args:
         reference_text (str): The reference text for relevance.
         candidate_text (str): The candidate text to evaluate.
@@ -17,14 +107,32 @@ def compute_similarity(reference_text, candidate_text):
     Returns:
         float: Cosine similarity score between 0 and 1.
     """
-    # Create embeddings
-    reference_embedding = model.encode(reference_text, convert_to_tensor=True)
-    candidate_embedding = model.encode(candidate_text, convert_to_tensor=True)
+    return float(compute_similarity_batch([reference_text], [candidate_text])[0, 0])
 
-    # Compute cosine similarity
-    cosine_similarity = np.dot(reference_embedding, candidate_embedding) / (np.linalg.norm(reference_embedding) * np.linalg.norm(candidate_embedding))
-    
-    return cosine_similarity.item()
+if njit is not None:
+    # Signature given so compilation happens at import rather than on first score
+    @njit('float64(int8[::1], int8[:, ::1])', cache=True, fastmath=True)
+    def _avg_cosine(content_vec, keyword_matrix):
+        content_norm = 0
+        for j in range(content_vec.shape[0]):
+            content_norm += np.int64(content_vec[j]) * content_vec[j]
+        total = 0.0
+        for i in range(keyword_matrix.shape[0]):
+            dot = 0
+            keyword_norm = 0
+            for j in range(content_vec.shape[0]):
+                dot += np.int64(content_vec[j]) * keyword_matrix[i, j]
+                keyword_norm += np.int64(keyword_matrix[i, j]) * keyword_matrix[i, j]
+            total += dot / max(np.sqrt(np.float64(keyword_norm * content_norm)), 1.0)
+        return total / keyword_matrix.shape[0]
+else:
+    def _avg_cosine(content_vec, keyword_matrix):
+        content_vec = content_vec.astype(np.int32)
+        keyword_matrix = keyword_matrix.astype(np.int32)
+        dots = keyword_matrix @ content_vec
+        scale = np.sqrt(np.einsum('ij,ij->i', keyword_matrix, keyword_matrix).astype(np.float64)
+                        * float(content_vec @ content_vec))
+        return float((dots / np.maximum(scale, 1.0)).mean())
 
 def score_content(extracted_content, keywords):
     """
@@ -37,11 +145,9 @@ def score_content(extracted_content, keywords):
     Returns:
         float: Overall relevance score.
     """
-    total_score = 0.0
-    for keyword in keywords:
-        score = compute_similarity(keyword, extracted_content)
-        total_score += score
+    if not keywords:
+        return 0
 
-    # Normalize score by the number of keywords
-    average_score = total_score / len(keywords) if keywords else 0
-    return average_score
+    # Content is encoded once alongside all keywords, then averaged in one loop
+    embeddings = _encode_cached(list(keywords) + [extracted_content])
+    return float(_avg_cosine(embeddings[-1], embeddings[:-1]))
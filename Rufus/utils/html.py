@@ -0,0 +1,22 @@
+# rufus/utils/html.py
+
+import lxml.html
+
+def parse_html(html, parse=lxml.html.document_fromstring):
+    """
+    Parses an HTML string with an lxml.html parsing function.
+
+    lxml rejects unicode strings that carry an XML encoding declaration, so
+    those are parsed again as UTF-8 bytes.
+
+    Args:
+        html (str): The HTML to parse.
+        parse (callable): lxml.html.document_fromstring, fromstring, etc.
+
+    Returns:
+        lxml.html.HtmlElement: The parsed element.
+    """
+    try:
+        return parse(html)
+    except ValueError:
+        return parse(html.encode('utf-8'))
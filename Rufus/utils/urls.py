@@ -0,0 +1,28 @@
+# rufus/utils/urls.py
+
+from urllib.parse import urldefrag, urlsplit, urlunsplit
+
+def normalize_url(url):
+    """
+    Normalizes a URL so trivially different spellings of a page compare equal.
+
+    Drops the fragment and any utm_* tracking parameters, lowercases the scheme
+    and host, and gives an empty path a trailing slash. Remaining query
+    parameters keep their original order and encoding.
+
+    Args:
+        url (str): The URL to normalize.
+
+    Returns:
+        str: The normalized URL.
+    """
+    url, _ = urldefrag(url.strip())
+    parts = urlsplit(url)
+
+    query = '&'.join(
+        param for param in parts.query.split('&')
+        if param and not param.lower().startswith('utm_')
+    )
+    path = parts.path or ('/' if parts.netloc else '')
+
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ''))
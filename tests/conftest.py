@@ -0,0 +1,32 @@
+# tests/conftest.py
+from types import SimpleNamespace
+
+
+class FakeLLM:
+    """
+    Stand-in for an LLM's agenerate.
+
+    Every prompt is answered with `response`, either a fixed text or a
+    function of the prompt, and the prompts of each call are recorded.
+    """
+    def __init__(self, response=lambda prompt: f"response to {prompt}"):
+        self.response = response
+        self.batches = []
+
+    @property
+    def calls(self):
+        """Prompts generated so far, across all calls."""
+        return sum(len(batch) for batch in self.batches)
+
+    def batch_sizes(self, marker):
+        """Sizes of the calls whose prompts contain marker."""
+        return [len(batch) for batch in self.batches if marker in batch[0]]
+
+    async def agenerate(self, prompts):
+        self.batches.append(list(prompts))
+        return SimpleNamespace(
+            generations=[[SimpleNamespace(text=self._respond(p))] for p in prompts]
+        )
+
+    def _respond(self, prompt):
+        return self.response(prompt) if callable(self.response) else self.response
@@ -0,0 +1,46 @@
+# tests/test_cache.py
+import pytest
+from Rufus.ai.cache import SemanticCache
+from tests.conftest import FakeLLM
+
+
+@pytest.mark.asyncio
+async def test_exact_hit_skips_llm():
+    llm = FakeLLM()
+    cache = SemanticCache(llm)
+    first = await cache.agenerate(["What are the HR policies?"])
+    second = await cache.agenerate(["What are the HR policies?"])
+    assert first == second
+    assert llm.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_semantic_hit_respects_namespace():
+    llm = FakeLLM()
+    cache = SemanticCache(llm, similarity_threshold=0.9)
+    content = "City employees must follow the HR policies and leave procedures"
+    await cache.agenerate(["prompt a"], semantic_keys=[content], namespace="analysis")
+    await cache.agenerate(["prompt b"], semantic_keys=[content + "!"], namespace="analysis")
+    assert llm.calls == 1
+
+    await cache.agenerate(["prompt c"], semantic_keys=[content], namespace="navigation")
+    assert llm.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    llm = FakeLLM()
+    cache = SemanticCache(llm, max_entries=1)
+    await cache.agenerate(["first prompt"], semantic_keys=["alpha"])
+    await cache.agenerate(["second prompt"], semantic_keys=["beta"])
+    await cache.agenerate(["first prompt"], semantic_keys=["alpha"])
+    assert llm.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_rejected_responses_are_not_cached():
+    llm = FakeLLM()
+    cache = SemanticCache(llm)
+    for _ in range(2):
+        await cache.agenerate(["What are the HR policies?"], validator=lambda text: False)
+    assert llm.calls == 2
@@ -1,7 +1,10 @@
+import asyncio
 import pytest
 import requests
 from Rufus.client import RufusClient
 from Rufus.ai.llm import SimpleLLM
+from Rufus.config.default import AI_CONFIG
+from tests.conftest import FakeLLM
 
 @pytest.fixture
 def client():
@@ -29,3 +32,123 @@ def test_scrape_json_placeholder(client):
     assert "id" in first_post
     assert "title" in first_post
     assert "body" in first_post
+
+
+class FakeCrawler:
+    """Serves a fixed link graph and records every URL it is asked to crawl."""
+    def __init__(self, site):
+        self.site = site
+        self.crawled = []
+
+    async def crawl(self, url):
+        self.crawled.append(url)
+        await asyncio.sleep(0)
+        return {
+            "url": url,
+            "content": f"<html><body><main><p>HR policies described on {url}</p></main></body></html>",
+            "structured_data": {},
+            "links": [{"url": link, "text": "HR policies"} for link in self.site.get(url, [])]
+        }
+
+    async def close(self):
+        pass
+
+
+ANALYSIS_REPLY = '```json\n{"relevance": 1.0, "key_information": "HR policies"}\n```'
+
+
+def analysis_batches(llm):
+    """Sizes of the analysis calls a FakeLLM received."""
+    return llm.batch_sizes("Analyze the following web content")
+
+
+class PassThroughSynthesizer:
+    """Returns the scored results as documents and saves nothing."""
+    def synthesize(self, results, format="json"):
+        return results
+
+    def save(self, documents, output_file):
+        pass
+
+
+ROOT = "https://example.com/"
+
+
+def make_offline_client(tmp_path, site, priorities=None, llm=None, **config):
+    """RufusClient wired to a FakeCrawler, a FakeLLM and no file output."""
+    llm = llm or FakeLLM(ANALYSIS_REPLY)
+    # Disable semantic hits so every uncached page reaches the fake LLM
+    config = dict(AI_CONFIG, llm_cache={"similarity_threshold": 1.0}, **config)
+    client = RufusClient(config=config, output_dir=str(tmp_path), llm=llm)
+    client.crawler = FakeCrawler(site)
+    client.synthesizer = PassThroughSynthesizer()
+    if priorities is not None:
+        client.ai_engine._estimate_links_relevance = (
+            lambda links, goal: [priorities[link["url"]] for link in links]
+        )
+    return client, llm
+
+
+@pytest.mark.asyncio
+async def test_scrape_respects_page_budget_and_never_recrawls(tmp_path):
+    site = {
+        ROOT: [f"{ROOT}a", f"{ROOT}b", f"{ROOT}c", f"{ROOT}d"],
+        f"{ROOT}a": [ROOT, f"{ROOT}b"],
+        f"{ROOT}b": [f"{ROOT}a", f"{ROOT}b#top"],
+    }
+    client, _ = make_offline_client(tmp_path, site)
+    await client.scrape(ROOT, "HR policies", max_pages=3, min_relevance=0.0)
+    await client.close()
+
+    crawled = client.crawler.crawled
+    assert len(crawled) == 3
+    assert len(set(crawled)) == len(crawled)
+
+
+@pytest.mark.asyncio
+async def test_scrape_pops_frontier_by_priority(tmp_path):
+    site = {ROOT: [f"{ROOT}low", f"{ROOT}high", f"{ROOT}mid"]}
+    priorities = {f"{ROOT}low": 0.2, f"{ROOT}high": 0.9, f"{ROOT}mid": 0.5}
+    # One page in flight at a time, so crawl order is pop order
+    client, _ = make_offline_client(tmp_path, site, priorities, max_concurrent_pages=1)
+    await client.scrape(ROOT, "HR policies", min_relevance=0.0)
+    await client.close()
+
+    assert client.crawler.crawled == [ROOT, f"{ROOT}high", f"{ROOT}mid", f"{ROOT}low"]
+
+
+@pytest.mark.asyncio
+async def test_scrape_scores_pages_in_analysis_batches(tmp_path):
+    site = {ROOT: [f"{ROOT}{i}" for i in range(5)]}
+    client, llm = make_offline_client(tmp_path, site, analysis_batch_size=2)
+    await client.scrape(ROOT, "HR policies", min_relevance=0.0)
+    await client.close()
+
+    assert sum(analysis_batches(llm)) == 6
+    assert max(analysis_batches(llm)) == 2
+
+
+@pytest.mark.asyncio
+async def test_scrape_cache_hit_skips_crawl_and_analysis(tmp_path):
+    site = {ROOT: [f"{ROOT}a", f"{ROOT}b"]}
+    client, llm = make_offline_client(tmp_path, site)
+    first = await client.scrape(ROOT, "HR policies", min_relevance=0.0)
+    crawled, batches = list(client.crawler.crawled), list(analysis_batches(llm))
+
+    second = await client.scrape(ROOT, "HR policies", min_relevance=0.0)
+    await client.close()
+
+    assert len(crawled) == 3
+    assert client.crawler.crawled == crawled
+    assert analysis_batches(llm) == batches
+    assert sorted(doc["url"] for doc in second) == sorted(doc["url"] for doc in first)
+
+
+@pytest.mark.asyncio
+async def test_scrape_does_not_cache_fallback_scores(tmp_path):
+    for _ in range(2):
+        # A fresh client each run, sharing the on-disk cache
+        client, llm = make_offline_client(tmp_path, {}, llm=FakeLLM("not json"))
+        await client.scrape(ROOT, "HR policies", min_relevance=0.0)
+        await client.close()
+        assert analysis_batches(llm) == [1]
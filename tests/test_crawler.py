@@ -8,10 +8,44 @@ async def test_crawler_basic():
     url = "https://example.com"
     result = await crawler.crawl(url)
     assert result is not None
+
+
+def test_extract_all_keeps_only_web_links():
+    from bs4 import BeautifulSoup
+    crawler = WebCrawler()
+    soup = BeautifulSoup(
+        '<a href="/about">About</a>'
+        '<a href="mailto:hr@example.com">Mail</a>'
+        '<a href="javascript:void(0)">Menu</a>'
+        '<a href="https://other.org/x">Other</a>',
+        'lxml'
+    )
+    links, _ = crawler._extract_all(soup, "https://example.com/")
+    assert [link["url"] for link in links] == [
+        "https://example.com/about",
+        "https://other.org/x"
+    ]
     
 
 '''def test_crawler_dynamic():
     crawler = WebCrawler()
     url = "https://dynamic-site.com"
     result = await crawler.crawl(url)
-    assert result["dynamic_content"] is not None'''
\ No newline at end of file
+    assert result["dynamic_content"] is not None'''
+
+@pytest.mark.asyncio
+async def test_crawl_falls_back_to_static_html_when_rendering_fails():
+    crawler = WebCrawler()
+    static = '<html><body><noscript>Enable JS</noscript><a href="/hr">HR</a></body></html>'
+
+    async def make_request(url):
+        return static
+
+    async def render(url):
+        raise RuntimeError("Executable doesn't exist")
+
+    crawler._make_request = make_request
+    crawler._handle_dynamic_content = render
+    result = await crawler.crawl("https://example.com/")
+    assert result["content"] == static
+    assert result["links"] == [{"url": "https://example.com/hr", "text": "HR"}]
@@ -0,0 +1,134 @@
+# tests/test_engine.py
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from sklearn.feature_extraction.text import HashingVectorizer
+from Rufus.ai import engine as engine_module
+from Rufus.ai.engine import RufusAIEngine
+from tests.conftest import FakeLLM
+
+
+class HostMatrix:
+    """Dense stand-in for a cuML sparse matrix; get() copies it to the host."""
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __getitem__(self, index):
+        return HostMatrix(np.atleast_2d(self.rows[index]))
+
+    def __matmul__(self, other):
+        return HostMatrix(self.rows @ other.rows)
+
+    @property
+    def T(self):
+        return HostMatrix(self.rows.T)
+
+    def toarray(self):
+        return self
+
+    def ravel(self):
+        return HostMatrix(self.rows.ravel())
+
+    def get(self):
+        return self.rows
+
+
+class StubGPUVectorizer:
+    """Counts transform calls and hashes on the CPU."""
+    def __init__(self):
+        self.calls = 0
+        self._vectorizer = HashingVectorizer(n_features=2**10, alternate_sign=False, norm='l2')
+
+    def transform(self, documents):
+        self.calls += 1
+        return HostMatrix(self._vectorizer.transform(list(documents)).toarray())
+
+
+@pytest.fixture
+def engine():
+    """Create a RufusAIEngine instance without an LLM backend."""
+    return RufusAIEngine(llm=None)
+
+
+def test_estimate_links_relevance(engine):
+    """Links matching the search goal should score above unrelated links."""
+    links = [
+        {"text": "HR policies and procedures", "url": "https://example.com/hr/policies"},
+        {"text": "Parking information", "url": "https://example.com/parking"},
+    ]
+    scores = engine._estimate_links_relevance(links, "HR policies")
+    assert scores.shape == (2,)
+    assert scores[0] > scores[1]
+
+
+def test_estimate_links_relevance_empty(engine):
+    """No links should produce no scores."""
+    assert len(engine._estimate_links_relevance([], "HR policies")) == 0
+
+
+def test_calculate_topic_match(engine):
+    """Topic match is a cosine score between 0 and 1."""
+    related = engine._calculate_topic_match("HR policies for city employees", "HR policies")
+    unrelated = engine._calculate_topic_match("Parking permits and street cleaning", "HR policies")
+    assert 0.0 < related <= 1.0
+    assert unrelated == 0.0
+
+
+@pytest.mark.asyncio
+async def test_analyze_content_relevance_parses_structured_output():
+    llm = FakeLLM('```json\n{"relevance": 1.0, "key_information": "HR leave policy"}\n```')
+    engine = RufusAIEngine(llm=llm)
+    scores = await engine.analyze_content_relevance_batch(
+        [("HR policies for city employees", "https://example.com/hr")],
+        "HR policies"
+    )
+    assert len(scores) == 1
+    assert scores[0].summary == "HR leave policy"
+    # Average of the TF-IDF score and the LLM's 1.0
+    assert 0.5 <= scores[0].relevance_score <= 1.0
+
+
+@pytest.mark.asyncio
+async def test_analyze_content_relevance_falls_back_on_bad_output():
+    engine = RufusAIEngine(llm=FakeLLM("not json"))
+    score = await engine.analyze_content_relevance(
+        "Parking permits and street cleaning", "HR policies", "https://example.com/parking"
+    )
+    assert score.relevance_score == 0.0
+    assert score.summary == ""
+
+
+@pytest.mark.asyncio
+async def test_unparseable_analysis_is_not_cached():
+    engine = RufusAIEngine(llm=FakeLLM("not json"))
+    await engine.analyze_content_relevance(
+        "HR policies for city employees", "HR policies", "https://example.com/hr"
+    )
+    assert not engine.llm_cache._entries
+
+
+def test_compiled_prompts_match_template_format(engine):
+    """Precompiled prompt rendering must match PromptTemplate.format."""
+    rendered = engine._render_prompt(engine._analysis_parts, content="Page {text}", query="HR")
+    assert rendered == engine.analysis_prompt.format(content="Page {text}", query="HR")
+
+
+def test_gpu_is_off_by_default(engine):
+    assert not engine._use_gpu
+
+
+def test_gpu_dispatch_respects_min_documents(engine, monkeypatch):
+    monkeypatch.setattr(engine_module, "cudf", SimpleNamespace(Series=list))
+    gpu = StubGPUVectorizer()
+    engine._use_gpu = True
+    engine._gpu_hashing_vectorizer = gpu
+    engine.gpu_min_documents = 4
+
+    small = engine._hashed_similarities(["HR policies"] * 3, "HR policies")
+    assert gpu.calls == 0
+    assert small.shape == (3,)
+
+    large = engine._hashed_similarities(["HR policies"] * 4 + ["Parking"], "HR policies")
+    assert gpu.calls == 1
+    assert large.shape == (5,)
+    assert large[0] > large[4]
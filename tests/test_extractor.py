@@ -0,0 +1,149 @@
+# tests/test_extractor.py
+import pytest
+from Rufus.core.extractor import ContentExtractionError, ContentExtractor
+
+TEST_HTML = """
+<html>
+    <head>
+        <title>HR Policies</title>
+        <meta name="description" content="City HR policies">
+        <meta property="og:title" content="HR Policies | City">
+        <script>var tracking = "ignore me";</script>
+    </head>
+    <body>
+        <nav><a href="/home">Home</a></nav>
+        <main>
+            <h1>Leave</h1>
+            <p>Employees accrue paid leave.</p>
+            <ul>
+                <li>Sick leave</li>
+                <li>Vacation</li>
+            </ul>
+            <h2>Benefits</h2>
+            <p>Health coverage starts on day one.</p>
+        </main>
+        <a href="https://example.com/jobs">Jobs</a>
+    </body>
+</html>
+"""
+
+
+@pytest.fixture
+def extractor():
+    extractor = ContentExtractor(instructions="leave policies")
+    yield extractor
+    extractor.close()
+
+
+def test_extract_structure(extractor):
+    result = extractor.extract(TEST_HTML, "https://example.com/hr")
+    assert result.title == "HR Policies"
+    assert result.metadata["description"] == "City HR policies"
+    assert result.metadata["og:title"] == "HR Policies | City"
+    assert list(result.links) == ["/home", "https://example.com/jobs"]
+    assert "Employees accrue paid leave." in result.main_content
+    assert "Home" not in result.main_content
+    assert "ignore me" not in result.main_content
+
+
+def test_extract_sections(extractor):
+    result = extractor.extract(TEST_HTML, "https://example.com/hr")
+    assert [section["header"] for section in result.sections] == ["Leave", "Benefits"]
+    assert result.sections[0]["content"] == "Employees accrue paid leave. Sick leave Vacation"
+    assert result.sections[1]["content"] == "Health coverage starts on day one."
+
+
+def test_extract_relevance(extractor):
+    result = extractor.extract(TEST_HTML, "https://example.com/hr")
+    assert 0.0 < result.relevance_score <= 1.0
+    assert ContentExtractor().extract(TEST_HTML, "https://example.com/hr").relevance_score == 1.0
+
+
+def test_extract_empty_document(extractor):
+    result = extractor.extract("", "https://example.com/empty")
+    assert result.title == ""
+    assert result.main_content == ""
+    assert result.sections == []
+
+
+def test_extract_streaming_matches_tree(extractor):
+    tree_result = extractor.extract(TEST_HTML, "https://example.com/hr")
+    stream_result = extractor.extract(TEST_HTML, "https://example.com/hr", include_sections=False)
+    assert stream_result.sections == []
+    assert stream_result.title == tree_result.title
+    assert stream_result.metadata == tree_result.metadata
+    assert stream_result.main_content == tree_result.main_content
+    assert list(stream_result.links) == list(tree_result.links)
+
+
+def test_section_content_collapses_whitespace_only_elements(extractor):
+    html = """
+    <html><body><div>
+        <h2>Leave</h2>
+        <p>Annual leave</p>
+        <p>   </p>
+        <p>Sick leave</p>
+    </div></body></html>
+    """
+    result = extractor.extract(html, "https://example.com/leave")
+    # Section text is cleaned once after joining, so the empty paragraph
+    # leaves a single space rather than two
+    assert result.sections[0]["content"] == "Annual leave Sick leave"
+
+
+@pytest.mark.parametrize("include_sections", [True, False])
+def test_extract_meta_with_name_and_og_property(extractor, include_sections):
+    html = '<html><head><meta name="twitter:title" property="og:title" content="T"></head></html>'
+    result = extractor.extract(html, "https://example.com/", include_sections=include_sections)
+    assert result.metadata == {"twitter:title": "T", "og:title": "T"}
+
+
+def test_extract_many_preserves_order(extractor):
+    pages = [(TEST_HTML.replace("HR Policies</title>", f"HR Policies {i}</title>"), f"https://example.com/{i}")
+             for i in range(10)]
+    results = extractor.extract_many(pages, max_workers=2)
+    assert [result.url for result in results] == [url for _, url in pages]
+    assert results[3].title == "HR Policies 3"
+    assert results[3].sections == extractor.extract(*pages[3]).sections
+
+
+def test_extract_many_reuses_worker_pool(extractor):
+    pages = [(TEST_HTML, f"https://example.com/{i}") for i in range(10)]
+    extractor.extract_many(pages, max_workers=2)
+    pool = extractor._pool
+    results = extractor.extract_many(pages, max_workers=2)
+    assert extractor._pool is pool
+    assert [result.url for result in results] == [url for _, url in pages]
+
+    extractor.close()
+    assert extractor._pool is None
+
+
+def test_extract_many_reports_failing_page_and_keeps_pool(extractor):
+    pages = [(TEST_HTML, f"https://example.com/{i}") for i in range(9)]
+    with pytest.raises(ContentExtractionError):
+        extractor.extract_many(pages + [("<!-- only a comment -->", "https://example.com/bad")],
+                               max_workers=2)
+    results = extractor.extract_many(pages, max_workers=2)
+    assert [result.url for result in results] == [url for _, url in pages]
+
+
+@pytest.mark.parametrize("include_sections", [True, False])
+def test_extract_main_container_priority(extractor, include_sections):
+    html = """
+    <html><body>
+        <div class="post">Class fallback</div>
+        <div role="main">Role main</div>
+        <article>Article</article>
+    </body></html>
+    """
+    result = extractor.extract(html, "https://example.com/", include_sections=include_sections)
+    assert result.main_content == "Role main"
+
+    without_role = html.replace('role="main"', '')
+    result = extractor.extract(without_role, "https://example.com/", include_sections=include_sections)
+    assert result.main_content == "Article"
+
+    class_only = without_role.replace("<article>Article</article>", "")
+    result = extractor.extract(class_only, "https://example.com/", include_sections=include_sections)
+    assert result.main_content == "Class fallback"
@@ -0,0 +1,10 @@
+# tests/test_html.py
+import lxml.html
+from Rufus.utils.html import parse_html
+
+
+def test_parse_html_accepts_encoding_declaration():
+    """Unicode input with an XML encoding declaration falls back to bytes."""
+    html = '<?xml version="1.0" encoding="utf-8"?><html><body><p>Café</p></body></html>'
+    assert parse_html(html).findtext('.//p') == "Café"
+    assert parse_html(html, lxml.html.fromstring).text_content() == "Café"
@@ -0,0 +1,19 @@
+# tests/test_urls.py
+import pytest
+from Rufus.utils.urls import normalize_url
+
+
+def test_normalize_url_collapses_duplicates():
+    """Fragment, tracking parameters and host case should not create new URLs."""
+    expected = "https://example.com/hr?page=2"
+    assert normalize_url("https://Example.COM/hr?page=2#benefits") == expected
+    assert normalize_url("https://example.com/hr?utm_source=mail&page=2") == expected
+
+
+def test_normalize_url_keeps_path_case_and_query_order():
+    url = "https://example.com/HR/Policies?b=2&a=1"
+    assert normalize_url(url) == url
+
+
+def test_normalize_url_empty_path():
+    assert normalize_url("https://example.com") == "https://example.com/"